@@ -57,70 +57,85 @@
 
 #         st.chat_message("assistant").markdown(reply)
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import os
 from dotenv import load_dotenv
 # OpenAI is optional at runtime (may not be installed on Streamlit Cloud or user may not provide a key)
 from booking_logic import extract_booking_state
-from slot_engine import check_availability, book_slot, find_next_available, list_bookings, attempt_resolve, auto_book_alternative
+from slot_engine import check_and_book, book_slot, find_next_available, list_bookings, attempt_resolve, auto_book_alternative
 from bookings_store import reset_bookings, seed_demo_bookings
 from pricing import calculate_price
 # lazy import receipts at runtime so the app still starts when optional deps are missing
-from i18n import detect_language, translate_text
+from i18n import detect_language, fast_lang, translate_text
 from signals import detect_urgency_and_style
 from explainability import compute_explainability_score
 from clarifier import generate_clarifying_question
+from summaries import SummaryBatchError, submit_summary_batch, collect_summary_batch
+from resilience import with_backoff
 from logger import get_logger
 import io
+import json
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
-logger = get_logger()
 
-load_dotenv()
-# Safe OpenAI client init: don't crash the app if the package or key is missing
-client = None
-try:
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    # try importing the official OpenAI client; if unavailable we'll continue without it
+@st.cache_resource
+def _get_app_logger():
+    return get_logger()
+
+
+@st.cache_resource
+def _get_client():
+    """Load .env and build the OpenAI client once per process instead of on every rerun."""
+    load_dotenv()
+    # Safe OpenAI client init: don't crash the app if the package or key is missing
     try:
-        from openai import OpenAI
-        if OPENAI_API_KEY:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-        else:
+        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+        # try importing the official OpenAI client; if unavailable we'll continue without it
+        try:
+            from openai import OpenAI
+            if OPENAI_API_KEY:
+                return OpenAI(api_key=OPENAI_API_KEY)
             logger.warning("OPENAI_API_KEY not set; OpenAI client disabled")
-            client = None
-    except Exception as imp_e:
-        logger.warning(f"OpenAI SDK not available: {imp_e}")
-        client = None
-except Exception:
-    client = None
+            return None
+        except Exception as imp_e:
+            logger.warning(f"OpenAI SDK not available: {imp_e}")
+            return None
+    except Exception:
+        return None
+
+
+logger = _get_app_logger()
+client = _get_client()
 
 st.set_page_config(page_title="Advanced AI Booking Assistant")
 st.title("🤖 Advanced AI Booking Assistant")
 
- # UI polish: pill-style chat input, softer border and spacing
-st.markdown(
-    """
-    <style>
-    /* pill style chat input */
-    .stTextInput>div>div>input, .stTextArea>div>textarea {
-        box-shadow: none !important;
-        border: 1px solid rgba(255,255,255,0.06) !important;
-        border-radius: 28px !important;
-        padding: 14px 56px 14px 20px !important;
-        background: rgba(255,255,255,0.02) !important;
-        color: #e6e6e6 !important;
-        font-size: 18px !important;
-    }
-    /* leave bottom space so input doesn't overlap content */
-    .block-container { padding-bottom: 120px; }
-    /* rounded send button look for download/send buttons */
-    .stButton>button { border-radius: 12px !important; }
-    .stDownloadButton>button { border-radius: 12px !important; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# UI polish: pill-style chat input, softer border and spacing.
+# Streamlit drops any element a rerun doesn't re-emit, so the style block is sent on every
+# run; it is kept unindented to keep that payload small.
+_CSS = """
+<style>
+/* pill style chat input */
+.stTextInput>div>div>input, .stTextArea>div>textarea {
+    box-shadow: none !important;
+    border: 1px solid rgba(255,255,255,0.06) !important;
+    border-radius: 28px !important;
+    padding: 14px 56px 14px 20px !important;
+    background: rgba(255,255,255,0.02) !important;
+    color: #e6e6e6 !important;
+    font-size: 18px !important;
+}
+/* leave bottom space so input doesn't overlap content */
+.block-container { padding-bottom: 120px; }
+/* rounded send button look for download/send buttons */
+.stButton>button { border-radius: 12px !important; }
+.stDownloadButton>button { border-radius: 12px !important; }
+</style>
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 SYSTEM_PROMPT = """
 You are an advanced AI booking assistant.
@@ -132,6 +147,204 @@ Rules:
 - Be polite, professional, and precise
 """
 
+BOOKINGS_PAGE_SIZE = 50
+
+
+# Optional heavy dependencies are imported on first use (so the app starts without them)
+# and the resolved callables are kept for the rest of the process.
+@st.cache_resource
+def _pdfgen():
+    from receipts import generate_pdf_bytes
+    return generate_pdf_bytes
+
+
+@st.cache_resource
+def _pdf_receipt():
+    from receipts import generate_pdf_receipt
+    return generate_pdf_receipt
+
+
+@st.cache_resource
+def _gtts():
+    from gtts import gTTS
+    return gTTS
+
+
+# Both detectors are pure functions of the message text; memoize them so
+# reruns on the same message (button clicks, toggles) skip the NLP work.
+@st.cache_data(max_entries=512, show_spinner=False)
+def _cached_detect_language(text: str):
+    return fast_lang(text) or detect_language(text)
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _cached_detect_urgency_and_style(text: str):
+    return detect_urgency_and_style(text)
+
+
+try:
+    from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+    _OPENAI_RETRYABLE = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+except Exception:
+    _OPENAI_RETRYABLE = (Exception,)
+
+
+@with_backoff(retry_on=_OPENAI_RETRYABLE)
+def _create_completion(**kwargs):
+    return client.chat.completions.create(**kwargs)
+
+
+def _tts_once(text: str, lang: str) -> bytes:
+    mp3_io = io.BytesIO()
+    _gtts()(text=text, lang=lang).write_to_fp(mp3_io)
+    return mp3_io.getvalue()
+
+
+@st.cache_resource
+def _tts_with_backoff():
+    # Only transient network failures are retried; a missing gTTS raises ImportError here,
+    # straight through to the caller's silent fallback. TTS sits on the confirmation path,
+    # so keep its backoff short.
+    import requests
+    from gtts.tts import gTTSError
+    return with_backoff(max_wait=4.0, retry_on=(gTTSError, requests.ConnectionError, requests.Timeout))(_tts_once)
+
+
+def _render_tts(text: str, lang: str) -> bytes:
+    return _tts_with_backoff()(text, lang)
+
+
+def _build_pdf(booking: dict) -> tuple:
+    """Return (pdf_bytes, file_name) for a booking receipt."""
+    # Prefer in-memory PDF generation (no filesystem). Fallback to file-based if needed.
+    try:
+        return _pdfgen()(booking), f"receipt_{booking.get('id')}.pdf"
+    except Exception:
+        try:
+            pdf_path = _pdf_receipt()(booking)
+            with open(pdf_path, "rb") as f:
+                return f.read(), os.path.basename(pdf_path)
+        except Exception as imp_e:
+            raise RuntimeError(f"Receipts module unavailable or generation failed: {imp_e}") from imp_e
+
+
+def stream_completion(model: str, system_prompt: str, msgs_tuple: tuple):
+    """Yield the assistant reply chunk by chunk as the model generates it.
+
+    `msgs_tuple` is a tuple of (role, content) pairs so the whole conversation is hashable.
+    """
+    stream = _create_completion(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            *({"role": role, "content": content} for role, content in msgs_tuple)
+        ],
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _msgs_json(msgs_tuple: tuple) -> str:
+    """Pretty-printed conversation JSON for the debug panel, serialized once per conversation state."""
+    msgs = [{"role": role, "content": content} for role, content in msgs_tuple]
+    try:
+        import orjson
+        return orjson.dumps(msgs, option=orjson.OPT_INDENT_2).decode("utf-8")
+    except ImportError:
+        return json.dumps(msgs, indent=2, ensure_ascii=False)
+
+
+def _render_confirmation(booking: dict, booking_info: dict, translated_summary: str, target_lang: str) -> None:
+    """Render the confirmed-booking view: summary, receipts and voice confirmation.
+
+    Kept apart from the booking pipeline so reruns can redraw it from session state.
+    """
+    st.success("✅ Booking Confirmed!")
+    st.json(booking_info)
+
+    st.markdown("### 📄 Booking Summary")
+    st.text(translated_summary)
+
+    # Receipt artifacts are generated once per booking and kept in session state, so
+    # reruns (e.g. clicking a download button) don't redo the PDF render or TTS request.
+    # A failed attempt is stored as None, so it isn't retried on every rerun either.
+    pdf_key = f"pdf_{booking.get('id')}"
+    tts_key = f"tts_{booking.get('id')}"
+    tts_lang = target_lang if target_lang in ("en", "hi", "te") else "en"
+
+    # The PDF render is CPU-bound and TTS waits on the network, so build whichever
+    # is missing concurrently: the wait becomes max(pdf, tts) instead of the sum.
+    # The workers get this run's script context so the st.cache_resource loaders they
+    # call behave as they would on the script thread.
+    with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as executor:
+        f_pdf = executor.submit(_build_pdf, booking) if pdf_key not in st.session_state else None
+        f_tts = executor.submit(_render_tts, translated_summary, tts_lang) if tts_key not in st.session_state else None
+
+    if f_tts is not None:
+        try:
+            st.session_state[tts_key] = f_tts.result()
+        except Exception:
+            # TTS not available or failed; continue silently
+            st.session_state[tts_key] = None
+
+    # Generate PDF receipt and offer a download (lazy import so missing optional deps don't break the app)
+    try:
+        if f_pdf is not None:
+            # None stays stored if the render failed; result() re-raises generation
+            # errors to the outer handler which will show debug info
+            st.session_state[pdf_key] = None
+            st.session_state[pdf_key] = f_pdf.result()
+        pdf_result = st.session_state[pdf_key]
+        if pdf_result is None:
+            st.info("PDF receipt is unavailable for this booking; use the text receipt below.")
+        else:
+            pdf_bytes, pdf_name = pdf_result
+            st.download_button("Download PDF receipt", data=pdf_bytes, file_name=pdf_name, mime="application/pdf")
+
+            # Voice confirmation (TTS) if it could be generated
+            mp3_bytes = st.session_state[tts_key]
+            if mp3_bytes:
+                st.audio(mp3_bytes)
+                st.download_button("Download voice confirmation (mp3)", data=mp3_bytes, file_name=f"confirmation_{booking.get('id')}.mp3", mime="audio/mpeg")
+
+    except Exception as e:
+        # Log exception and show detailed debug info in UI to help diagnose missing libs / data issues
+        logger.exception("Receipt generation failed")
+        st.warning(f"Could not generate PDF receipt: {e}")
+        st.caption("Booking object (for debugging):")
+        try:
+            st.json(booking)
+        except Exception:
+            st.text(str(booking))
+        st.caption("Traceback:")
+        st.text(traceback.format_exc())
+        # the plain-text receipt below is the fallback download
+
+    # Always offer a plain-text receipt as a guaranteed download option (safe fallback)
+    try:
+        bid, svc, date_, time_, loc, price, currency = (
+            booking.get(k) for k in ("id", "service", "date", "time", "location", "price", "currency")
+        )
+        currency = currency or ""
+        txt_lines = [
+            f"Booking ID: {bid}",
+            f"Service: {svc}",
+            f"Date: {date_}",
+            f"Time: {time_}",
+            f"Location: {loc}",
+            f"Price: {currency} {price}",
+            f"Total Amount: {currency} {price}",
+            "\nThank you for your booking!"
+        ]
+        txt = "\n".join(txt_lines).encode("utf-8")
+        st.download_button("Download text receipt", data=txt, file_name=f"receipt_{bid}.txt", mime="text/plain")
+    except Exception:
+        st.error("Failed to create fallback receipt")
+
+
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
@@ -142,15 +355,24 @@ if user_input:
         {"role": "user", "content": user_input}
     )
 
+# st.chat_input returns None on widget reruns, so each message goes through the pipeline once;
+# reruns redraw the stored confirmation below instead
+if user_input:
+    # a new turn replaces whatever confirmation was on screen
+    st.session_state.pop("confirmation", None)
+
+    last_text = st.session_state.messages[-1]["content"]
+    # the analysers are pure CPU work on this turn's text; run them inline (a thread pool adds
+    # no overlap under the GIL and its threads lack the Streamlit script context)
     state = extract_booking_state(st.session_state.messages)
     missing = [k for k in ["service", "date", "time", "location"] if not state[k]]
 
     # use signals to adapt tone/urgency
-    is_urgent, preferred_style = detect_urgency_and_style(st.session_state.messages[-1]["content"]) if st.session_state.messages else (False, "friendly")
+    is_urgent, preferred_style = _cached_detect_urgency_and_style(last_text)
 
     # detect user language preference from last message
     try:
-        user_lang = detect_language(st.session_state.messages[-1]["content"]) if st.session_state.messages else None
+        user_lang = _cached_detect_language(last_text)
     except Exception:
         user_lang = None
     target_lang = user_lang if user_lang in ("te", "hi") else "en"
@@ -198,9 +420,6 @@ if user_input:
     
     # CONFIRM BOOKING
     elif not missing:
-        # Check availability for requested service/date/time
-        available, slots = check_availability(state["service"], state["date"], state["time"])
-
         booking = None
 
         # If the user delegated, show a one-click confirmation and prefer the assistant-chosen slot
@@ -227,103 +446,104 @@ if user_input:
             else:
                 booking = None
 
-        elif not available:
-            # attempt automatic resolution
-            st.error(f"❌ Selected time unavailable. Considering alternatives...")
-            resolution = attempt_resolve(state["service"], state["date"], state["time"], allow_nearby=True)
-            st.write(resolution)
-            if resolution.get("suggestion"):
-                if st.button(f"Auto-book suggested slot {resolution.get('suggestion')}"):
-                    try:
-                        new_booking = auto_book_alternative(state["service"], state["date"], state["time"])
-                        st.success(f"Auto-booked {new_booking.get('time')} (id={new_booking.get('id')})")
-                        # ensure the unified post-booking flow runs for this auto-booking
-                        booking = new_booking
-                        logger.info(f"Auto-booked suggested slot, booking id={new_booking.get('id')}")
-                    except Exception as e:
-                        st.error(f"Auto-book failed: {e}")
         else:
-            # Book the slot immediately (non-delegated confirmed booking)
+            # Book the slot immediately (non-delegated confirmed booking); the availability
+            # check and the insert are a single atomic store call
             try:
-                booking = book_slot(state["service"], state["date"], state["time"], state.get("location"))
+                booking, conflict_slots = check_and_book(state["service"], state["date"], state["time"], state.get("location"))
             except Exception as e:
                 st.error(f"Could not create booking: {e}")
-                booking = None
+                booking, conflict_slots = None, None
+
+            if booking is None and conflict_slots is not None:
+                # attempt automatic resolution
+                st.error(f"❌ Selected time unavailable. Considering alternatives...")
+                resolution = attempt_resolve(state["service"], state["date"], state["time"], allow_nearby=True)
+                st.write(resolution)
+                if resolution.get("suggestion"):
+                    if st.button(f"Auto-book suggested slot {resolution.get('suggestion')}"):
+                        try:
+                            new_booking = auto_book_alternative(state["service"], state["date"], state["time"])
+                            st.success(f"Auto-booked {new_booking.get('time')} (id={new_booking.get('id')})")
+                            # ensure the unified post-booking flow runs for this auto-booking
+                            booking = new_booking
+                            logger.info(f"Auto-booked suggested slot, booking id={new_booking.get('id')}")
+                        except Exception as e:
+                            st.error(f"Auto-book failed: {e}")
 
         # If a booking was created by any branch, run the post-booking flow
         if booking:
             try:
                 confidence = round(100 - (len(st.session_state.messages) * 2), 2)
 
+                # bind the receipt fields once; they feed the JSON view, the summary and the receipts
+                # (ensure a booking id exists so receipts always include an ID)
+                bid = booking.get("id") or str(uuid.uuid4())
+                svc, date_, time_, loc = (booking.get(k) for k in ("service", "date", "time", "location"))
+                delegated = state.get("delegated", False)
+                explanation = state.get("explanation", "")[:1000]
+                location_auto_selected = state.get("location_auto_selected", False)
+                service_auto_selected = state.get("service_auto_selected", False)
+
                 # pricing (currency-aware)
-                price, discount, currency = calculate_price(booking.get("service"), confidence, booking.get("meta"), location=booking.get("location"))
+                price, discount, currency = calculate_price(svc, confidence, booking.get("meta"), location=loc)
                 symbol = "₹" if currency == "INR" else "$"
 
-                st.success("✅ Booking Confirmed!")
-
                 # enrich booking dict for receipts
-                booking["price"] = price
-                booking["currency"] = currency
-                booking["discount_percent"] = discount
-                booking["delegated"] = state.get("delegated", False)
-                booking["explanation"] = state.get("explanation", "")[:1000]
-                # carry over auto-selection flags from state so UI can label them
-                booking["location_auto_selected"] = state.get("location_auto_selected", False)
-                booking["service_auto_selected"] = state.get("service_auto_selected", False)
-
-                # ensure a booking id exists so receipts always include an ID
-                if not booking.get("id"):
-                    booking["id"] = str(uuid.uuid4())
+                booking.update({
+                    "id": bid,
+                    "price": price,
+                    "currency": currency,
+                    "discount_percent": discount,
+                    "delegated": delegated,
+                    "explanation": explanation,
+                    # carry over auto-selection flags from state so UI can label them
+                    "location_auto_selected": location_auto_selected,
+                    "service_auto_selected": service_auto_selected,
+                })
 
                 # prepare booking info dict and human summary
                 booking_info = {
-                    "id": booking.get("id") or str(uuid.uuid4()),
-                    "service": booking.get("service"),
-                    "date": booking.get("date"),
-                    "time": booking.get("time"),
-                    "location": booking.get("location"),
+                    "id": bid,
+                    "service": svc,
+                    "date": date_,
+                    "time": time_,
+                    "location": loc,
                     "confidence_score": f"{confidence}%",
                     "price": f"{symbol}{price}",
                     "discount_percent": f"{discount}%",
                     "currency": currency,
-                    "delegated": booking.get("delegated", False),
-                    "explanation": booking.get("explanation", "")[:1000],
+                    "delegated": delegated,
+                    "explanation": explanation,
                     "status": "confirmed"
                 }
-                st.json(booking_info)
 
                 # Format date for human readability (Weekday, dd Mon YYYY) when possible
-                try:
-                    from datetime import datetime as _dt
-                    d = booking.get('date')
-                    if d:
-                        try:
-                            display_date = _dt.fromisoformat(d).strftime('%A, %d %b %Y')
-                        except Exception:
-                            display_date = d
-                    else:
-                        display_date = ""
-                except Exception:
-                    display_date = booking.get('date', '')
+                display_date = date_ or ""
+                if date_:
+                    try:
+                        display_date = datetime.fromisoformat(date_).strftime('%A, %d %b %Y')
+                    except Exception:
+                        pass
 
-                display_location = booking_info.get('location') or ''
-                if booking.get('location_auto_selected'):
+                display_location = loc or ''
+                if location_auto_selected:
                     display_location = f"{display_location} (auto-selected)"
-                display_service = booking_info.get('service') or ''
-                if booking.get('service_auto_selected'):
+                display_service = svc or ''
+                if service_auto_selected:
                     display_service = f"{display_service} (auto-selected)"
 
                 summary_en = (
-                    f"Booking ID: {booking_info['id']}\n"
+                    f"Booking ID: {bid}\n"
                     f"Service: {display_service}\n"
                     f"Date: {display_date}\n"
-                    f"Time: {booking_info['time']}\n"
+                    f"Time: {time_}\n"
                     f"Location: {display_location}\n"
                     f"AI Confidence: {confidence}%\n"
                     f"Price: {symbol}{price} (Discount: {discount}%)\n"
-                    f"Delegated: {booking_info.get('delegated')}\n"
-                    f"Explanation: {booking_info.get('explanation')}\n"
-                    f"Currency: {booking_info.get('currency')}"
+                    f"Delegated: {delegated}\n"
+                    f"Explanation: {explanation}\n"
+                    f"Currency: {currency}"
                 )
 
                 # translate summary if needed
@@ -332,87 +552,14 @@ if user_input:
                 except Exception:
                     translated_summary = summary_en
 
-                st.markdown("### 📄 Booking Summary")
-                st.text(translated_summary)
-
-                # Generate PDF receipt and offer a download (lazy import so missing optional deps don't break the app)
-                try:
-                    # Prefer in-memory PDF generation (no filesystem). Fallback to file-based if needed.
-                    try:
-                        from receipts import generate_pdf_bytes
-                        pdf_bytes = generate_pdf_bytes(booking)
-                        st.download_button("Download PDF receipt", data=pdf_bytes, file_name=f"receipt_{booking.get('id')}.pdf", mime="application/pdf")
-                    except Exception:
-                        try:
-                            from receipts import generate_pdf_receipt
-                            pdf_path = generate_pdf_receipt(booking)
-                            with open(pdf_path, "rb") as f:
-                                pdf_bytes = f.read()
-                            st.download_button("Download PDF receipt", data=pdf_bytes, file_name=os.path.basename(pdf_path), mime="application/pdf")
-                        except Exception as imp_e:
-                            # re-raise to outer handler which will show debug info
-                            raise RuntimeError(f"Receipts module unavailable or generation failed: {imp_e}") from imp_e
-
-                    # Try generating voice confirmation (TTS) if available
-                    try:
-                        from gtts import gTTS
-                        mp3_io = io.BytesIO()
-                        tts_lang = target_lang if target_lang in ("en", "hi", "te") else "en"
-                        tts = gTTS(text=translated_summary, lang=tts_lang)
-                        tts.write_to_fp(mp3_io)
-                        mp3_io.seek(0)
-                        st.audio(mp3_io.getvalue())
-                        st.download_button("Download voice confirmation (mp3)", data=mp3_io.getvalue(), file_name=f"confirmation_{booking.get('id')}.mp3", mime="audio/mpeg")
-                    except Exception:
-                        # TTS not available or failed; continue silently
-                        pass
-
-                except Exception as e:
-                    # Log exception and show detailed debug info in UI to help diagnose missing libs / data issues
-                    logger.exception("Receipt generation failed")
-                    st.warning(f"Could not generate PDF receipt: {e}")
-                    st.caption("Booking object (for debugging):")
-                    try:
-                        st.json(booking)
-                    except Exception:
-                        st.text(str(booking))
-                    st.caption("Traceback:")
-                    st.text(traceback.format_exc())
-
-                    # Fallback: produce a simple text receipt for download
-                    try:
-                        txt_lines = [
-                            f"Booking ID: {booking.get('id')}",
-                            f"Service: {booking.get('service')}",
-                            f"Date: {booking.get('date')}",
-                            f"Time: {booking.get('time')}",
-                            f"Location: {booking.get('location')}",
-                            f"Price: {booking.get('currency', '')} {booking.get('price')}",
-                            f"Total Amount: {booking.get('currency', '')} {booking.get('price')}",
-                            "\nThank you for your booking!"
-                        ]
-                        txt = "\n".join(txt_lines).encode("utf-8")
-                        st.download_button("Download text receipt", data=txt, file_name=f"receipt_{booking.get('id')}.txt", mime="text/plain")
-                    except Exception:
-                        st.error("Failed to create fallback receipt")
-
-                # Always offer a plain-text receipt as a guaranteed download option (safe fallback)
-                try:
-                    txt_lines = [
-                        f"Booking ID: {booking.get('id')}",
-                        f"Service: {booking.get('service')}",
-                        f"Date: {booking.get('date')}",
-                        f"Time: {booking.get('time')}",
-                        f"Location: {booking.get('location')}",
-                        f"Price: {booking.get('currency', '')} {booking.get('price')}",
-                        f"Total Amount: {booking.get('currency', '')} {booking.get('price')}",
-                        "\nThank you for your booking!"
-                    ]
-                    txt = "\n".join(txt_lines).encode("utf-8")
-                    st.download_button("Download text receipt", data=txt, file_name=f"receipt_{booking.get('id')}.txt", mime="text/plain")
-                except Exception:
-                    # if even text fallback fails, silently continue
-                    pass
+                # keep the confirmation so widget-triggered reruns can redraw it
+                st.session_state.confirmation = {
+                    "booking": booking,
+                    "booking_info": booking_info,
+                    "translated_summary": translated_summary,
+                    "target_lang": target_lang,
+                }
+                _render_confirmation(**st.session_state.confirmation)
 
             except Exception as e:
                 st.error(f"Post-booking processing failed: {e}")
@@ -420,19 +567,17 @@ if user_input:
     # CONTINUE CONVERSATION
     else:
         # If OpenAI client isn't available, fall back to a safe local message so the app doesn't crash on deploy
+        streamed = False
         if client is None:
             st.warning("AI backend unavailable. To enable AI responses, install the OpenAI SDK and set the OPENAI_API_KEY environment variable.")
             reply = "I can't reach the AI service right now. Please provide the missing details and I'll proceed with booking using available info."
         else:
+            msgs_tuple = tuple((m["role"], m["content"]) for m in st.session_state.messages)
             try:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        *st.session_state.messages
-                    ]
-                )
-                reply = response.choices[0].message.content
+                # stream tokens as they arrive so the user sees the reply progressively
+                with st.chat_message("assistant"):
+                    reply = st.write_stream(stream_completion("gpt-4o-mini", SYSTEM_PROMPT, msgs_tuple))
+                streamed = True
             except Exception as e:
                 logger.exception("OpenAI request failed")
                 st.warning("AI request failed; falling back to a local response.")
@@ -441,15 +586,33 @@ if user_input:
         st.session_state.messages.append(
             {"role": "assistant", "content": reply}
         )
-        st.chat_message("assistant").markdown(reply)
+        if not streamed:
+            st.chat_message("assistant").markdown(reply)
+
+elif st.session_state.get("confirmation"):
+    # reruns triggered by widgets (downloads, admin buttons) redraw the last confirmation
+    # from session state instead of re-running extraction, pricing and receipts
+    _render_confirmation(**st.session_state.confirmation)
 
 # UNIQUE: Admin Debug Panel
-with st.expander("🔧 Debug / Admin Panel"):
-    st.json(st.session_state.messages)
+# An expander runs its body even while collapsed, so the panel sits behind a toggle and
+# the bookings store is only queried when someone actually opens it.
+if st.checkbox("🔧 Show Debug / Admin Panel", key="admin_open"):
+    st.code(_msgs_json(tuple((m["role"], m["content"]) for m in st.session_state.messages)), language="json")
     st.markdown("### Current bookings")
     try:
-        bookings = list_bookings()
+        # render one page at a time, oldest first; the cursor is the (created_at, id) of the
+        # last booking shown on the previous page
+        cursor = st.session_state.get("bookings_cursor")
+        bookings = list_bookings(after=cursor, limit=BOOKINGS_PAGE_SIZE)
         st.json(bookings)
+        col_first, col_next = st.columns(2)
+        if cursor and col_first.button("First page"):
+            st.session_state.bookings_cursor = None
+            st.rerun()
+        if len(bookings) == BOOKINGS_PAGE_SIZE and col_next.button("Next page"):
+            st.session_state.bookings_cursor = (bookings[-1]["created_at"], bookings[-1]["id"])
+            st.rerun()
     except Exception as e:
         st.warning(f"Could not load bookings: {e}")
     st.markdown("---")
@@ -464,8 +627,34 @@ with st.expander("🔧 Debug / Admin Panel"):
 
     if st.button("Seed demo bookings"):
         try:
-            seed_demo_bookings()
+            seeded = seed_demo_bookings()
             st.success("Demo bookings have been added.")
             logger.info("Admin action: demo bookings seeded")
+            # summaries aren't needed immediately, so queue them as one discounted batch job
+            if client is not None:
+                try:
+                    batch_id = submit_summary_batch(client, seeded)
+                    if batch_id:
+                        st.session_state.summary_batch_id = batch_id
+                        st.info(f"AI summaries queued for the demo bookings (batch {batch_id}).")
+                except Exception as e:
+                    logger.warning(f"Could not submit summary batch: {e}")
         except Exception as e:
             st.error(f"Failed to seed demo bookings: {e}")
+
+    if client is not None and st.session_state.get("summary_batch_id") and st.button("Fetch demo booking summaries"):
+        try:
+            summaries = collect_summary_batch(client, st.session_state.summary_batch_id)
+            if summaries is None:
+                st.info("The summary batch is still processing; try again later.")
+            else:
+                st.success(f"Stored {len(summaries)} AI summaries on the demo bookings.")
+                logger.info(f"Summary batch {st.session_state.summary_batch_id} collected")
+                del st.session_state["summary_batch_id"]
+        except SummaryBatchError as e:
+            # the job is over for good; stop offering to fetch it
+            logger.warning(str(e))
+            st.error(f"{e}. Seed the demo bookings again to queue a new batch.")
+            del st.session_state["summary_batch_id"]
+        except Exception as e:
+            st.error(f"Failed to fetch summaries: {e}")
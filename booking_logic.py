@@ -22,9 +22,13 @@
 #             state["location"] = text
 
 #     return state
+import copy
 import re
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional, Set
 from time_utils import normalize_time
 from slot_engine import find_next_available
 
@@ -37,18 +41,86 @@ CITIES = [
     "bangalore", "delhi", "mumbai",
     "chennai", "hyderabad", "mangalagiri", "vijayawada"
 ]
+# exact-match lookups; CITIES keeps the priority order for keyword matches
+_CITIES_SET = frozenset(CITIES)
 
+# patterns used on every message, compiled once at import
+_DATE_SLASH_RE = re.compile(r"(\d{1,2}/\d{1,2}/\d{2,4})")
+_DATE_ISO_RE = re.compile(r"(\d{4}-\d{1,2}-\d{1,2})")
+_LOC_IN_RE = re.compile(r"in\s+([a-zA-Z ]{3,30})")
+_DIGIT_RE = re.compile(r"\d")
 
-def _parse_date(text: str) -> Optional[str]:
-    text = text.lower()
-    today = datetime.now().date()
+# Phrases where the user delegates decisions to the assistant
+# e.g. "you decide", "book it", "go ahead", "surprise me", "anything works"
+_DELEGATION_PHRASES = (
+    "you decide",
+    "you pick",
+    "you choose",
+    "book it",
+    "do it",
+    "go ahead",
+    "surprise me",
+    "anything works",
+    "i don't care",
+    "i dont care",
+    "up to you",
+    "whatever you think",
+)
+_CANCEL_WORDS = ("cancel", "cancelled", "delete")
+_MODIFY_WORDS = ("change", "modify", "reschedule")
+# sub-types that refine a generic 'appointment'
+_FACIAL_WORDS = ("facial", "face", "skincare", "cleaning", "derma")
+_DENTAL_WORDS = ("dental", "dentist")
+# fuzzy time words -> concrete times (per policy); a dict rather than a frozenset because
+# earlier entries win ('afternoon' must be tried before 'noon')
+_FUZZY_TIME_MAP = {
+    "morning": "10:00 AM",
+    "afternoon": "02:00 PM",
+    "evening": "06:00 PM",
+    "night": "08:00 PM",
+    "noon": "12:00 PM",
+    "after lunch": "02:00 PM",
+    "before lunch": "11:30 AM",
+}
+
+
+class _SubstringMatcher:
+    """Finds every keyword with one `keyword in text` test per keyword.
+
+    str.__contains__ is a C-level search, so for a few dozen keywords this beats a
+    single regex alternation that is retried at every character position.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self._words = tuple(set(words))
+
+    def find(self, text: str) -> Set[str]:
+        return {w for w in self._words if w in text}
+
+
+# one matcher over every keyword family extract_booking_state looks for
+_KEYWORDS = _SubstringMatcher(
+    set(SERVICES) | set(CITIES) | set(_DELEGATION_PHRASES) | set(_CANCEL_WORDS) | set(_MODIFY_WORDS)
+    | set(_FACIAL_WORDS) | set(_DENTAL_WORDS) | set(_FUZZY_TIME_MAP)
+)
+# once service/date/time/location are all set, later messages can still change intent,
+# delegation and the appointment sub-type, but never the fields themselves
+_FILLED_KEYWORDS = _SubstringMatcher(
+    set(_DELEGATION_PHRASES) | set(_CANCEL_WORDS) | set(_MODIFY_WORDS) | set(_FACIAL_WORDS) | set(_DENTAL_WORDS)
+)
+
+
+@lru_cache(maxsize=2048)
+def _parse_date_static(text: str) -> Optional[str]:
+    """Date-independent part of `_parse_date`; relative words come back as the sentinels
+    "today"/"tomorrow" so the cached result stays valid across days."""
     if "today" in text:
-        return today.isoformat()
+        return "today"
     if "tomorrow" in text:
-        return (today + timedelta(days=1)).isoformat()
+        return "tomorrow"
 
     # common formats: dd/mm/yyyy, dd/mm/yy, yyyy-mm-dd
-    m = re.search(r"(\d{1,2}/\d{1,2}/\d{2,4})", text)
+    m = _DATE_SLASH_RE.search(text)
     if m:
         for fmt in ("%d/%m/%Y", "%d/%m/%y"):
             try:
@@ -56,7 +128,7 @@ def _parse_date(text: str) -> Optional[str]:
             except Exception:
                 continue
 
-    m2 = re.search(r"(\d{4}-\d{1,2}-\d{1,2})", text)
+    m2 = _DATE_ISO_RE.search(text)
     if m2:
         try:
             return datetime.strptime(m2.group(1), "%Y-%m-%d").date().isoformat()
@@ -66,130 +138,175 @@ def _parse_date(text: str) -> Optional[str]:
     return None
 
 
-def extract_booking_state(messages):
-    """Extract booking state from a list of message dicts.
+def _parse_date(text: str) -> Optional[str]:
+    parsed = _parse_date_static(text.lower())
+    if parsed == "today":
+        return datetime.now().date().isoformat()
+    if parsed == "tomorrow":
+        return (datetime.now().date() + timedelta(days=1)).isoformat()
+    return parsed
 
-    Returns a dict with keys: service, date (ISO), time (H:MM AM/PM), location, intent
-    """
-    state = {
-        "service": None,
-        "date": None,
-        "time": None,
-        "location": None,
-        "intent": "book",
-        "delegated": False,
-        # flags to indicate assistant-made defaults (do not silently pretend these were user-provided)
-        "location_auto_selected": False,
-        "service_auto_selected": False,
+
+# only the most recent explanations are kept, so long sessions don't grow the joined string forever
+_MAX_EXPLANATIONS = 32
+
+
+def _new_accumulator() -> dict:
+    return {
+        "state": {
+            "service": None,
+            "date": None,
+            "time": None,
+            "location": None,
+            "intent": "book",
+            "delegated": False,
+            # flags to indicate assistant-made defaults (do not silently pretend these were user-provided)
+            "location_auto_selected": False,
+            "service_auto_selected": False,
+        },
+        # short explanations and confidence scores per entity
+        "confidences": {"service": 0.0, "date": 0.0, "time": 0.0, "location": 0.0},
+        "explanations": deque(maxlen=_MAX_EXPLANATIONS),
+        "explicit_location": None,
     }
 
-    # We'll collect short explanations and confidence scores per entity
-    confidences = {"service": 0.0, "date": 0.0, "time": 0.0, "location": 0.0}
-    ambiguities = []
-    explanations = []
-
-    for msg in messages:
-        text = msg.get("content", "").lower()
-
-        # capture explicit 'in <city>' patterns even if city is not in our known list
-        m_loc = re.search(r"in\s+([a-zA-Z ]{3,30})", text)
-        if m_loc:
-            candidate = m_loc.group(1).strip().lower()
-            # prefer exact known city names, otherwise record as explicit_location
-            if candidate in CITIES:
-                if not state.get("location"):
-                    state["location"] = candidate
-                    confidences["location"] = 0.9
-                    explanations.append(f"Location matched via pattern: {candidate}")
-            else:
-                # record an explicit freeform location for later use
-                explicit_location = candidate
-                explanations.append(f"Explicit location mentioned: {candidate}")
-
-        # Detect explicit delegation phrases where the user delegates decisions to the assistant
-        # e.g. "you decide", "book it", "go ahead", "surprise me", "anything works"
-        delegation_phrases = [
-            "you decide",
-            "you pick",
-            "you choose",
-            "book it",
-            "do it",
-            "go ahead",
-            "surprise me",
-            "anything works",
-            "i don't care",
-            "i dont care",
-            "up to you",
-            "whatever you think",
-        ]
-        if any(p in text for p in delegation_phrases):
-            state["delegated"] = True
-            explanations.append("User delegated decision-making to assistant")
-
-        # Intent detection
-        if any(word in text for word in ["cancel", "cancelled", "delete"]):
-            state["intent"] = "cancel"
-        elif any(word in text for word in ["change", "modify", "reschedule"]):
-            state["intent"] = "modify"
-
-        # Service detection (prefer first matched service)
+
+def _absorb_message(acc: dict, msg: dict) -> None:
+    """Fold one message into the running extraction accumulator (see `_new_accumulator`)."""
+    state, confidences, explanations = acc["state"], acc["confidences"], acc["explanations"]
+    text = msg.get("content", "").lower()
+    filled = state["service"] and state["date"] and state["time"] and state["location"]
+    # every keyword present in this message, found in a single pass
+    found = (_FILLED_KEYWORDS if filled else _KEYWORDS).find(text)
+
+    # capture explicit 'in <city>' patterns even if city is not in our known list
+    m_loc = _LOC_IN_RE.search(text)
+    if m_loc:
+        candidate = m_loc.group(1).strip().lower()
+        # prefer exact known city names, otherwise record as explicit_location
+        if candidate in _CITIES_SET:
+            if not state.get("location"):
+                state["location"] = candidate
+                confidences["location"] = 0.9
+                explanations.append(f"Location matched via pattern: {candidate}")
+        else:
+            # record an explicit freeform location for later use
+            acc["explicit_location"] = candidate
+            explanations.append(f"Explicit location mentioned: {candidate}")
+
+    # Detect explicit delegation phrases where the user delegates decisions to the assistant
+    if any(p in found for p in _DELEGATION_PHRASES):
+        state["delegated"] = True
+        explanations.append("User delegated decision-making to assistant")
+
+    # Intent detection
+    if any(word in found for word in _CANCEL_WORDS):
+        state["intent"] = "cancel"
+    elif any(word in found for word in _MODIFY_WORDS):
+        state["intent"] = "modify"
+
+    # Service detection (prefer first matched service)
+    if not state["service"]:
         for s in SERVICES:
-            if s in text and not state["service"]:
+            if s in found:
                 state["service"] = s
                 confidences["service"] = 0.95
                 explanations.append(f"Service matched by keyword '{s}'")
+                break
+
+    # If the user said generic 'appointment' but later specified sub-type like 'facial', map it
+    if state.get("service") == "appointment":
+        if any(k in found for k in _FACIAL_WORDS):
+            state["service"] = "facial"
+            confidences["service"] = 0.9
+            explanations.append("Mapped generic 'appointment' to specific 'facial' based on user text")
+        elif any(k in found for k in _DENTAL_WORDS):
+            state["service"] = "dental"
+            confidences["service"] = 0.9
+            explanations.append("Mapped generic 'appointment' to specific 'dental' based on user text")
 
-        # If the user said generic 'appointment' but later specified sub-type like 'facial', map it
-        if state.get("service") == "appointment":
-            if any(k in text for k in ["facial", "face", "skincare", "cleaning", "derma"]):
-                state["service"] = "facial"
-                confidences["service"] = 0.9
-                explanations.append("Mapped generic 'appointment' to specific 'facial' based on user text")
-            elif any(k in text for k in ["dental", "dentist"]):
-                state["service"] = "dental"
-                confidences["service"] = 0.9
-                explanations.append("Mapped generic 'appointment' to specific 'dental' based on user text")
-
-        # Date detection
-        if not state["date"]:
-            parsed = _parse_date(text)
-            if parsed:
-                state["date"] = parsed
-                confidences["date"] = 0.9
-                explanations.append(f"Date parsed as {parsed}")
-
-        # Time detection (supports fuzzy expressions like 'morning', 'evening')
-        if not state["time"]:
-            # exact time
+    if filled:
+        # field extraction below would be a no-op
+        return
+
+    # Date detection
+    if not state["date"]:
+        parsed = _parse_date(text)
+        if parsed:
+            state["date"] = parsed
+            confidences["date"] = 0.9
+            explanations.append(f"Date parsed as {parsed}")
+
+    # Time detection (supports fuzzy expressions like 'morning', 'evening')
+    if not state["time"]:
+        # exact time; normalize_time needs a digit plus ':' or am/pm, which most messages lack
+        time_value = None
+        if (":" in text or "am" in text or "pm" in text) and _DIGIT_RE.search(text):
             time_value = normalize_time(text)
-            if time_value:
-                state["time"] = time_value
-                confidences["time"] = 0.95
-                explanations.append(f"Time normalized to {time_value}")
-            else:
-                # fuzzy time words -> resolve to concrete times (per policy)
-                fuzzy_map = {
-                    "morning": "10:00 AM",
-                    "afternoon": "02:00 PM",
-                    "evening": "06:00 PM",
-                    "night": "08:00 PM",
-                    "noon": "12:00 PM",
-                    "after lunch": "02:00 PM",
-                    "before lunch": "11:30 AM",
-                }
-                for w, resolved in fuzzy_map.items():
-                    if w in text:
-                        state["time"] = resolved
-                        confidences["time"] = 0.7
-                        explanations.append(f"Fuzzy time '{w}' resolved to {resolved}")
-                        break
-
-        # Location detection
+        if time_value:
+            state["time"] = time_value
+            confidences["time"] = 0.95
+            explanations.append(f"Time normalized to {time_value}")
+        elif not found.isdisjoint(_FUZZY_TIME_MAP):
+            # fuzzy time words -> resolve to concrete times (per policy)
+            for w, resolved in _FUZZY_TIME_MAP.items():
+                if w in found:
+                    state["time"] = resolved
+                    confidences["time"] = 0.7
+                    explanations.append(f"Fuzzy time '{w}' resolved to {resolved}")
+                    break
+
+    # Location detection
+    if not state["location"]:
         for city in CITIES:
-            if city in text and not state["location"]:
+            if city in found:
                 state["location"] = city
                 confidences["location"] = 0.9
                 explanations.append(f"Location matched: {city}")
+                break
+
+
+# Conversations are replayed in full on every rerun; remember the accumulator per message list
+# so each call only folds in the messages added since the last one.
+# id(messages) -> (today, messages seen, last message seen, accumulator)
+_STATE_CACHE: "OrderedDict[int, tuple]" = OrderedDict()
+_STATE_CACHE_MAX = 64
+_STATE_CACHE_LOCK = threading.Lock()
+
+
+def extract_booking_state(messages):
+    """Extract booking state from a list of message dicts.
+
+    Returns a dict with keys: service, date (ISO), time (H:MM AM/PM), location, intent
+    """
+    today = datetime.now().date().isoformat()
+    key = id(messages)
+    with _STATE_CACHE_LOCK:
+        cached = _STATE_CACHE.get(key)
+    acc, seen = None, 0
+    if cached is not None:
+        c_today, c_seen, c_last, c_acc = cached
+        # the list must have only grown since: same day ('today' parsing) and same last message object
+        if c_today == today and 0 < c_seen <= len(messages) and messages[c_seen - 1] is c_last:
+            acc, seen = copy.deepcopy(c_acc), c_seen
+    if acc is None:
+        acc = _new_accumulator()
+
+    for msg in messages[seen:]:
+        _absorb_message(acc, msg)
+
+    if messages:
+        with _STATE_CACHE_LOCK:
+            _STATE_CACHE[key] = (today, len(messages), messages[-1], acc)
+            _STATE_CACHE.move_to_end(key)
+            while len(_STATE_CACHE) > _STATE_CACHE_MAX:
+                _STATE_CACHE.popitem(last=False)
+
+    # defaults below depend on live bookings, so they are applied to a copy on every call
+    state = dict(acc["state"])
+    confidences = dict(acc["confidences"])
+    explanations = deque(acc["explanations"], maxlen=_MAX_EXPLANATIONS)
+    ambiguities = []
 
     # attach confidences, ambiguities and explanation summary
     # If the user explicitly delegated and some fields are missing, infer reasonable defaults
@@ -233,7 +350,8 @@ def extract_booking_state(messages):
                 explanations.append("Defaulted time to 10:00 AM due to delegation (slot lookup failed)")
         # default location: prefer any explicit_location captured earlier, then CITIES[0]
         if not state.get("location"):
-            if 'explicit_location' in locals() and explicit_location:
+            explicit_location = acc["explicit_location"]
+            if explicit_location:
                 state["location"] = explicit_location
                 confidences["location"] = 0.8
                 explanations.append(f"Used earlier mentioned location '{explicit_location}' due to delegation")
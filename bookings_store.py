@@ -2,17 +2,34 @@
 
 This module exposes the same functions used elsewhere in the project:
 - load_bookings()
+- load_bookings_page(after=None, limit=50)
 - add_booking(booking: dict) -> dict
+- add_booking_if_free(booking: dict) -> dict | None
 - update_booking(booking_id: str, updates: dict) -> dict | None
 - remove_booking(booking_id: str) -> bool
+- find_booking_by_id(booking_id: str) -> dict | None
 - find_bookings(service=None, date=None, time=None)
+- find_bookings_for_day(service=None, date=None) -> set of booked times
 
-The SQLite DB is located at `bookings.db` next to this module.
+The SQLite DB is located at `bookings.db` next to this module. The hot meta fields (salon,
+total, currency, items) are stored in their own columns; other meta keys go to `extras_json`.
 """
 import os
 import json
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set, Tuple
+
+# meta columns are encoded/decoded on every read and write; orjson does this several times faster
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "bookings.db")
 JSON_FALLBACK = os.path.join(os.path.dirname(__file__), "bookings.json")
@@ -28,14 +45,51 @@ def _use_sqlite() -> bool:
 
 if _use_sqlite():
     import sqlite3
-
-    def _conn():
-        conn = sqlite3.connect(DB_PATH, timeout=5)
-        conn.row_factory = sqlite3.Row
+    import threading
+
+    # one connection per thread, kept open for the life of the process
+    _local = threading.local()
+    # serializes writers across threads so they queue here instead of on SQLite's busy timeout
+    _WRITE_LOCK = threading.Lock()
+
+    def _get_conn():
+        conn = getattr(_local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(DB_PATH, timeout=5)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers run alongside a writer; NORMAL sync is safe under WAL
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            _local.conn = conn
         return conn
 
+    # (column, type) for the fields split out of the booking meta dict
+    _META_COLUMNS = (
+        ("salon", "TEXT"),
+        ("total", "REAL"),
+        ("currency", "TEXT"),
+        ("items_json", "TEXT"),
+        ("extras_json", "TEXT"),
+    )
+    _INSERT_SQL = (
+        "INSERT INTO bookings (id, service, date, time, location, created_at, "
+        "salon, total, currency, items_json, extras_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def _split_meta(meta: Optional[dict]) -> tuple:
+        """(salon, total, currency, items_json, extras_json) column values for a meta dict."""
+        rest = dict(meta or {})
+        salon = rest.pop("salon") if isinstance(rest.get("salon"), str) else None
+        total = rest.get("total")
+        total = rest.pop("total") if isinstance(total, (int, float)) and not isinstance(total, bool) else None
+        currency = rest.pop("currency") if isinstance(rest.get("currency"), str) else None
+        items_json = _dumps(rest.pop("items")) if "items" in rest else None
+        extras_json = _dumps(rest) if rest else None
+        return salon, total, currency, items_json, extras_json
+
     def _ensure_db():
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
         cur.execute(
             """
@@ -50,34 +104,77 @@ if _use_sqlite():
             )
             """
         )
+        # migration: hot meta fields get their own columns; `meta` is only read for legacy rows
+        existing = {row["name"] for row in cur.execute("PRAGMA table_info(bookings)")}
+        for column, decl in _META_COLUMNS:
+            if column not in existing:
+                cur.execute(f"ALTER TABLE bookings ADD COLUMN {column} {decl}")
+        # find_bookings filters on service/date/time; load_bookings and the page cursor
+        # order by (created_at, id), which supersedes the old created_at-only index
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_bookings_service_date ON bookings(service, date)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_bookings_date_time ON bookings(date, time)")
+        cur.execute("DROP INDEX IF EXISTS idx_bookings_created")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_bookings_created_id ON bookings(created_at, id)")
         conn.commit()
-        conn.close()
 
     _ensure_db()
 
+    def _row_to_dict(r) -> Dict:
+        meta = {}
+        try:
+            if r["meta"]:
+                # legacy row written before the column split
+                meta = _loads(r["meta"])
+            else:
+                if r["extras_json"]:
+                    meta = _loads(r["extras_json"])
+                if r["salon"] is not None:
+                    meta["salon"] = r["salon"]
+                if r["total"] is not None:
+                    meta["total"] = r["total"]
+                if r["currency"] is not None:
+                    meta["currency"] = r["currency"]
+                if r["items_json"]:
+                    meta["items"] = _loads(r["items_json"])
+        except Exception:
+            meta = {}
+        return {
+            "id": r["id"],
+            "service": r["service"],
+            "date": r["date"],
+            "time": r["time"],
+            "location": r["location"],
+            "created_at": r["created_at"],
+            "meta": meta,
+        }
+
     def load_bookings() -> List[Dict]:
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
         cur.execute("SELECT * FROM bookings ORDER BY created_at")
         rows = cur.fetchall()
-        conn.close()
-        out = []
-        for r in rows:
-            meta = {}
-            try:
-                meta = json.loads(r["meta"]) if r["meta"] else {}
-            except Exception:
-                meta = {}
-            out.append({
-                "id": r["id"],
-                "service": r["service"],
-                "date": r["date"],
-                "time": r["time"],
-                "location": r["location"],
-                "created_at": r["created_at"],
-                "meta": meta,
-            })
-        return out
+        return [_row_to_dict(r) for r in rows]
+
+
+    def load_bookings_page(after: Optional[Tuple[str, str]] = None, limit: int = 50) -> List[Dict]:
+        """Return up to `limit` bookings in creation order, starting after the cursor `after`.
+
+        `after` is the (created_at, id) of the last booking on the previous page; the id breaks
+        ties between bookings created in the same instant. Keyset pagination: the
+        (created_at, id) index seeks straight to the cursor, so a page costs the same no
+        matter how deep into the table it is (unlike OFFSET).
+        """
+        conn = _get_conn()
+        cur = conn.cursor()
+        if after:
+            cur.execute(
+                "SELECT * FROM bookings WHERE (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?",
+                (after[0], after[1], limit),
+            )
+        else:
+            cur.execute("SELECT * FROM bookings ORDER BY created_at, id LIMIT ?", (limit,))
+        rows = cur.fetchall()
+        return [_row_to_dict(r) for r in rows]
 
 
     from uuid import uuid4
@@ -89,17 +186,54 @@ if _use_sqlite():
 
 
     def add_booking(booking: dict) -> dict:
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
         booking_id = generate_booking_id()
         created_at = datetime.utcnow().isoformat() + "Z"
-        meta = json.dumps(booking.get("meta", {}))
-        cur.execute(
-            "INSERT INTO bookings (id, service, date, time, location, created_at, meta) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (booking_id, booking.get("service"), booking.get("date"), booking.get("time"), booking.get("location"), created_at, meta),
-        )
-        conn.commit()
-        conn.close()
+        meta_cols = _split_meta(booking.get("meta", {}))
+        with _WRITE_LOCK:
+            cur.execute(
+                _INSERT_SQL,
+                (booking_id, booking.get("service"), booking.get("date"), booking.get("time"), booking.get("location"), created_at)
+                + meta_cols,
+            )
+            conn.commit()
+        return {
+            "id": booking_id,
+            "service": booking.get("service"),
+            "date": booking.get("date"),
+            "time": booking.get("time"),
+            "location": booking.get("location"),
+            "created_at": created_at,
+            "meta": booking.get("meta", {}),
+        }
+
+
+    def add_booking_if_free(booking: dict) -> Optional[dict]:
+        """Insert `booking` unless its service/date/time slot is already taken.
+
+        The conflict check and the insert are a single statement, so two concurrent
+        requests can't both take the same slot. Returns the new booking, or None on conflict.
+        """
+        conn = _get_conn()
+        cur = conn.cursor()
+        booking_id = generate_booking_id()
+        created_at = datetime.utcnow().isoformat() + "Z"
+        meta_cols = _split_meta(booking.get("meta", {}))
+        with _WRITE_LOCK:
+            cur.execute(
+                "INSERT INTO bookings (id, service, date, time, location, created_at, "
+                "salon, total, currency, items_json, extras_json) "
+                "SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM bookings WHERE service IS ? AND date IS ? AND time IS ?)",
+                (booking_id, booking.get("service"), booking.get("date"), booking.get("time"), booking.get("location"), created_at)
+                + meta_cols
+                + (booking.get("service"), booking.get("date"), booking.get("time")),
+            )
+            inserted = cur.rowcount
+            conn.commit()
+        if inserted <= 0:
+            return None
         return {
             "id": booking_id,
             "service": booking.get("service"),
@@ -113,15 +247,15 @@ if _use_sqlite():
 
     def reset_bookings() -> None:
         """Delete all bookings from the database (admin action)."""
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
-        cur.execute("DELETE FROM bookings")
-        conn.commit()
-        conn.close()
+        with _WRITE_LOCK:
+            cur.execute("DELETE FROM bookings")
+            conn.commit()
 
 
-    def seed_demo_bookings():
-        """Insert a few demo bookings for presentation/testing.
+    def seed_demo_bookings() -> List[Dict]:
+        """Insert a few demo bookings for presentation/testing and return them.
 
         Demos include itemized services, currency, and salon contact info. Dates are
         relative to today so seeded rows look current.
@@ -173,98 +307,109 @@ if _use_sqlite():
                 },
             },
         ]
-        for d in demos:
-            # attach items and total to top-level booking where helpful
-            b = {
+        # one timestamp per row, a microsecond apart, so (created_at, id) ordering keeps
+        # the demos in insertion order instead of tie-breaking on random ids
+        now = datetime.utcnow()
+        seeded = [
+            {
+                "id": generate_booking_id(),
                 "service": d.get("service"),
                 "date": d.get("date"),
                 "time": d.get("time"),
                 "location": d.get("location"),
+                "created_at": (now + timedelta(microseconds=i)).isoformat(timespec="microseconds") + "Z",
                 "meta": d.get("meta", {}),
             }
-            # also set top-level items/total for receipts convenience
-            if "items" in d["meta"]:
-                b["items"] = d["meta"]["items"]
-            if "total" in d["meta"]:
-                b["total"] = d["meta"]["total"]
-            add_booking(b)
+            for i, d in enumerate(demos)
+        ]
+        rows = [
+            (b["id"], b["service"], b["date"], b["time"], b["location"], b["created_at"]) + _split_meta(b["meta"])
+            for b in seeded
+        ]
+        # one transaction for the whole batch instead of a commit per row
+        conn = _get_conn()
+        with _WRITE_LOCK:
+            conn.executemany(_INSERT_SQL, rows)
+            conn.commit()
+        return seeded
 
 
     def update_booking(booking_id: str, updates: dict) -> Optional[dict]:
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
         # build set clause
         fields = []
         vals = []
         for k, v in updates.items():
             if k == "meta":
-                fields.append("meta = ?")
-                vals.append(json.dumps(v or {}))
+                # rewriting meta also moves a legacy row onto the split columns
+                fields.append("meta = NULL")
+                for (column, _), value in zip(_META_COLUMNS, _split_meta(v)):
+                    fields.append(f"{column} = ?")
+                    vals.append(value)
             else:
                 fields.append(f"{k} = ?")
                 vals.append(v)
         if not fields:
-            conn.close()
             return None
         vals.append(booking_id)
-        cur.execute(f"UPDATE bookings SET {', '.join(fields)} WHERE id = ?", tuple(vals))
-        conn.commit()
-        conn.close()
+        with _WRITE_LOCK:
+            cur.execute(f"UPDATE bookings SET {', '.join(fields)} WHERE id = ?", tuple(vals))
+            conn.commit()
         # return updated booking
-        matches = find_bookings()
-        for b in matches:
-            if b.get("id") == booking_id:
-                return b
-        return None
+        return find_booking_by_id(booking_id)
+
+
+    def find_booking_by_id(booking_id: str) -> Optional[dict]:
+        """Single-row primary-key lookup."""
+        cur = _get_conn().cursor()
+        cur.execute("SELECT * FROM bookings WHERE id = ?", (booking_id,))
+        row = cur.fetchone()
+        return _row_to_dict(row) if row else None
 
 
     def remove_booking(booking_id: str) -> bool:
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
-        cur.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
-        changed = cur.rowcount
-        conn.commit()
-        conn.close()
+        with _WRITE_LOCK:
+            cur.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
+            changed = cur.rowcount
+            conn.commit()
         return changed > 0
 
 
+    def _find_sql(has_service: bool, has_date: bool, has_time: bool) -> str:
+        clauses = [c for c, on in (("service = ?", has_service), ("date = ?", has_date), ("time = ?", has_time)) if on]
+        return "SELECT * FROM bookings" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+
+    # (has_service, has_date, has_time) -> SQL; identical strings also hit the per-connection
+    # prepared-statement cache of sqlite3, so each filter combination is parsed once
+    _FIND_STMT_CACHE = {
+        (s, d, t): _find_sql(s, d, t) for s in (False, True) for d in (False, True) for t in (False, True)
+    }
+
     def find_bookings(service=None, date=None, time=None) -> List[Dict]:
-        conn = _conn()
+        conn = _get_conn()
         cur = conn.cursor()
-        query = "SELECT * FROM bookings"
-        clauses = []
-        vals = []
-        if service:
-            clauses.append("service = ?")
-            vals.append(service)
-        if date:
-            clauses.append("date = ?")
-            vals.append(date)
-        if time:
-            clauses.append("time = ?")
-            vals.append(time)
-        if clauses:
-            query += " WHERE " + " AND ".join(clauses)
-        cur.execute(query, tuple(vals))
+        query = _FIND_STMT_CACHE[(bool(service), bool(date), bool(time))]
+        vals = tuple(v for v in (service, date, time) if v)
+        cur.execute(query, vals)
         rows = cur.fetchall()
-        conn.close()
-        out = []
-        for r in rows:
-            meta = {}
-            try:
-                meta = json.loads(r["meta"]) if r["meta"] else {}
-            except Exception:
-                meta = {}
-            out.append({
-                "id": r["id"],
-                "service": r["service"],
-                "date": r["date"],
-                "time": r["time"],
-                "location": r["location"],
-                "created_at": r["created_at"],
-                "meta": meta,
-            })
-        return out
+        return [_row_to_dict(r) for r in rows]
+
+
+    # (has_service, has_date) -> SQL selecting only the booked times
+    _DAY_STMT_CACHE = {
+        (s, d): _find_sql(s, d, False).replace("SELECT *", "SELECT time", 1) for s in (False, True) for d in (False, True)
+    }
+
+    def find_bookings_for_day(service=None, date=None) -> Set[str]:
+        """Booked times for a service on a date, in one query (same filter rules as find_bookings)."""
+        conn = _get_conn()
+        cur = conn.cursor()
+        query = _DAY_STMT_CACHE[(bool(service), bool(date))]
+        cur.execute(query, tuple(v for v in (service, date) if v))
+        return {r["time"] for r in cur.fetchall()}
 
 
 else:
@@ -285,6 +430,17 @@ else:
                 return []
 
 
+    def load_bookings_page(after=None, limit=50):
+        def key(b):
+            return (b.get("created_at") or "", b.get("id") or "")
+
+        bookings = sorted(load_bookings(), key=key)
+        if after:
+            after = tuple(after)
+            bookings = [b for b in bookings if key(b) > after]
+        return bookings[:limit]
+
+
     def save_bookings(bookings):
         _ensure_file()
         with open(JSON_FALLBACK, "w") as f:
@@ -313,6 +469,25 @@ else:
         return booking_entry
 
 
+    def add_booking_if_free(booking: dict) -> Optional[dict]:
+        bookings = load_bookings()
+        for b in bookings:
+            if (b.get("service"), b.get("date"), b.get("time")) == (booking.get("service"), booking.get("date"), booking.get("time")):
+                return None
+        booking_entry = {
+            "id": generate_booking_id(bookings),
+            "service": booking.get("service"),
+            "date": booking.get("date"),
+            "time": booking.get("time"),
+            "location": booking.get("location"),
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "meta": booking.get("meta", {})
+        }
+        bookings.append(booking_entry)
+        save_bookings(bookings)
+        return booking_entry
+
+
     def update_booking(booking_id: str, updates: dict) -> Optional[dict]:
         bookings = load_bookings()
         for b in bookings:
@@ -323,6 +498,10 @@ else:
         return None
 
 
+    def find_booking_by_id(booking_id: str) -> Optional[dict]:
+        return next((b for b in load_bookings() if b.get("id") == booking_id), None)
+
+
     def remove_booking(booking_id: str) -> bool:
         bookings = load_bookings()
         new = [b for b in bookings if b.get("id") != booking_id]
@@ -346,6 +525,10 @@ else:
         return out
 
 
+    def find_bookings_for_day(service=None, date=None) -> Set[str]:
+        return {b.get("time") for b in find_bookings(service=service, date=date)}
+
+
     # Admin helpers for JSON fallback
     def reset_bookings() -> None:
         """Reset the JSON bookings file (delete all bookings)."""
@@ -400,6 +583,7 @@ else:
                 },
             },
         ]
+        seeded = []
         for d in demos:
             b = {
                 "service": d.get("service"),
@@ -412,4 +596,5 @@ else:
                 b["items"] = d["meta"]["items"]
             if "total" in d["meta"]:
                 b["total"] = d["meta"]["total"]
-            add_booking(b)
+            seeded.append(add_booking(b))
+        return seeded
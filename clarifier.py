@@ -1,5 +1,30 @@
 from typing import Dict, Any, Optional
 
+# common fuzzy time words mapped to the ranges they usually mean
+_FUZZY_RANGES = {
+    "morning": "between 7 AM and 11 AM",
+    "afternoon": "between 12 PM and 4 PM",
+    "evening": "between 4 PM and 9 PM",
+    "night": "after 9 PM",
+    "noon": "around 12 PM",
+    "after lunch": "between 2 PM and 4 PM",
+}
+
+# question to ask when a field was extracted with low confidence
+_FIELD_QUESTIONS_LOW = {
+    "location": "Which city or location do you prefer for this booking?",
+    "service": "Which service would you like (e.g., spa, salon, doctor)?",
+    "time": "What time of day do you prefer? (e.g., 9 AM, afternoon, evening)",
+    "date": "On which date would you like the booking?",
+}
+
+# question to ask when a field is missing, checked in this order
+_FIELD_QUESTIONS_MISSING = {
+    "service": "Which service do you want to book? (spa, salon, doctor, etc.)",
+    "date": "Which date would you prefer for this booking?",
+    "time": "What time would you like?",
+    "location": "Which city or location should I use for this booking?",
+}
 
 def generate_clarifying_question(state: Dict[str, Any]) -> Optional[str]:
     """Generate a single concise clarifying question from booking state.
@@ -9,44 +34,18 @@ def generate_clarifying_question(state: Dict[str, Any]) -> Optional[str]:
     # prioritize ambiguous tokens
     ambiguities = state.get("ambiguities", []) or []
     if ambiguities:
-        # for common fuzzy words map to ranges
-        fuzzy_map = {
-            "morning": "between 7 AM and 11 AM",
-            "afternoon": "between 12 PM and 4 PM",
-            "evening": "between 4 PM and 9 PM",
-            "night": "after 9 PM",
-            "noon": "around 12 PM",
-            "after lunch": "between 2 PM and 4 PM",
-        }
         token = ambiguities[0]
-        if token in fuzzy_map:
-            return f"When you say '{token}', do you mean {fuzzy_map[token]}?"
+        if token in _FUZZY_RANGES:
+            return f"When you say '{token}', do you mean {_FUZZY_RANGES[token]}?"
         return f"Could you clarify what you mean by '{token}' for the time?"
 
     # next, low confidence fields
     confidences = state.get("confidences", {}) or {}
-    low = [k for k, v in confidences.items() if isinstance(v, (int, float)) and v < 0.7]
-    if low:
-        field = low[0]
-        if field == "location":
-            return "Which city or location do you prefer for this booking?"
-        if field == "service":
-            return "Which service would you like (e.g., spa, salon, doctor)?"
-        if field == "time":
-            return "What time of day do you prefer? (e.g., 9 AM, afternoon, evening)"
-        if field == "date":
-            return "On which date would you like the booking?"
+    field = next((k for k, v in confidences.items() if isinstance(v, (int, float)) and v < 0.7), None)
+    # an unknown low-confidence key falls through to the missing-field check
+    question = _FIELD_QUESTIONS_LOW.get(field)
+    if question:
+        return question
 
     # finally, missing fields
-    for f in ("service", "date", "time", "location"):
-        if not state.get(f):
-            if f == "service":
-                return "Which service do you want to book? (spa, salon, doctor, etc.)"
-            if f == "date":
-                return "Which date would you prefer for this booking?"
-            if f == "time":
-                return "What time would you like?"
-            if f == "location":
-                return "Which city or location should I use for this booking?"
-
-    return None
+    return next((q for f, q in _FIELD_QUESTIONS_MISSING.items() if not state.get(f)), None)
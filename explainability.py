@@ -1,4 +1,31 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+_FIELDS = ("service", "date", "time", "location")
+
+
+def _avg_confidence(confidences: Dict[str, Any]) -> float:
+    # fast path: the four float confidences extract_booking_state always fills in
+    # (summed in dict order, exactly like the general path)
+    if len(confidences) == 4:
+        a, b, c, d = confidences.values()
+        if type(a) is float and type(b) is float and type(c) is float and type(d) is float:
+            return (a + b + c + d) / 4
+    vals = [v for v in confidences.values() if isinstance(v, (int, float))]
+    return sum(vals) / len(vals) if vals else 0.0
+
+
+def _missing_count(state: Dict[str, Any]) -> int:
+    # only fields present in the state but empty count as missing
+    n = 0
+    for k in _FIELDS:
+        if k in state and not state[k]:
+            n += 1
+    return n
 
 
 def compute_explainability_score(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -14,16 +41,13 @@ def compute_explainability_score(state: Dict[str, Any]) -> Dict[str, Any]:
     ambiguities = state.get("ambiguities", []) or []
 
     # average confidence across known fields
-    if confidences:
-        vals = [v for v in confidences.values() if isinstance(v, (int, float))]
-        avg_conf = sum(vals) / len(vals) if vals else 0.0
-    else:
-        avg_conf = 0.0
+    avg_conf = _avg_confidence(confidences) if confidences else 0.0
 
     # penalties
-    ambiguity_penalty = min(len(ambiguities) * 0.15, 0.45)  # up to 45% penalty
-    missing = [k for k, v in state.items() if k in ("service", "date", "time", "location") and not v]
-    missing_penalty = min(len(missing) * 0.1, 0.3)
+    n_ambiguous = len(ambiguities)
+    ambiguity_penalty = min(n_ambiguous * 0.15, 0.45)  # up to 45% penalty
+    n_missing = _missing_count(state)
+    missing_penalty = min(n_missing * 0.1, 0.3)
 
     # compute raw score in 0-1
     raw = avg_conf * (1.0 - ambiguity_penalty - missing_penalty)
@@ -31,11 +55,28 @@ def compute_explainability_score(state: Dict[str, Any]) -> Dict[str, Any]:
 
     breakdown = {
         "avg_confidence": round(avg_conf * 100, 2),
-        "ambiguity_count": len(ambiguities),
+        "ambiguity_count": n_ambiguous,
         "ambiguity_penalty_pct": round(ambiguity_penalty * 100, 2),
-        "missing_count": len(missing),
+        "missing_count": n_missing,
         "missing_penalty_pct": round(missing_penalty * 100, 2),
         "score": round(score, 2)
     }
 
     return breakdown
+
+
+def compute_explainability_scores(states: Sequence[Dict[str, Any]]) -> List[float]:
+    """Scores (0-100) for many candidate states at once, e.g. to rank alternative extractions.
+
+    Same values as `compute_explainability_score(state)["score"]`; the penalty and clipping
+    arithmetic is vectorized with numpy when it is installed.
+    """
+    if np is None or not states:
+        return [compute_explainability_score(s)["score"] for s in states]
+    n = len(states)
+    avg = np.fromiter((_avg_confidence(s.get("confidences", {}) or {}) for s in states), dtype=float, count=n)
+    ambiguous = np.fromiter((len(s.get("ambiguities", []) or []) for s in states), dtype=float, count=n)
+    missing = np.fromiter((_missing_count(s) for s in states), dtype=float, count=n)
+    raw = avg * (1.0 - np.minimum(ambiguous * 0.15, 0.45) - np.minimum(missing * 0.1, 0.3))
+    scores = np.clip(raw, 0.0, 1.0) * 100.0
+    return [round(float(x), 2) for x in scores]
@@ -2,23 +2,49 @@
 
 Uses `langdetect` for language detection and `googletrans` for translation.
 If these are unavailable at runtime the functions will fall back to identity.
+Both are imported on first use: loading language profiles and building the translator
+costs noticeable startup time when no translation is ever requested.
 """
+from functools import lru_cache
 from typing import Optional
-try:
-    from langdetect import detect
-except Exception:
-    detect = None
+from resilience import with_backoff
 
-try:
-    from googletrans import Translator
-    _translator = Translator()
-except Exception:
-    _translator = None
 
+@lru_cache(maxsize=1)
+def _get_detect():
+    try:
+        from langdetect import detect
+        return detect
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _get_translator():
+    try:
+        from googletrans import Translator
+        return Translator()
+    except Exception:
+        return None
+
+
+def fast_lang(text: str) -> Optional[str]:
+    """Cheap pre-filter run before `detect_language`.
 
+    Pure-ASCII text is taken as English: the languages the UI switches to (Telugu, Hindi)
+    are written in non-Latin scripts. Returns None when the real detector is needed.
+    """
+    if text and text.isascii():
+        return "en"
+    return None
+
+
+# langdetect runs a probabilistic model per call; the same text always gets the same answer
+@lru_cache(maxsize=4096)
 def detect_language(text: str) -> Optional[str]:
     if not text:
         return None
+    detect = _get_detect()
     if detect is None:
         return None
     try:
@@ -27,13 +53,36 @@ def detect_language(text: str) -> Optional[str]:
         return None
 
 
+def _translate_once(text: str, dest: str) -> str:
+    return _get_translator().translate(text, dest=dest).text
+
+
+@lru_cache(maxsize=1)
+def _translate_with_backoff():
+    # googletrans talks over httpx (already loaded with the translator); only its timeout
+    # and connection errors are worth retrying. Translation is on the interactive path,
+    # so keep the backoff short.
+    try:
+        import httpx
+        retry_on = (httpx.TimeoutException, httpx.NetworkError)
+    except Exception:
+        retry_on = ()
+    return with_backoff(max_wait=4.0, retry_on=retry_on)(_translate_once)
+
+
+# each translation is a network round trip; only successful results are cached
+# (failures raise through the cache)
+@lru_cache(maxsize=4096)
+def _translate(text: str, dest: str) -> str:
+    return _translate_with_backoff()(text, dest)
+
+
 def translate_text(text: str, dest: str) -> str:
     if not text or not dest:
         return text
-    if _translator is None:
+    if _get_translator() is None:
         return text
     try:
-        res = _translator.translate(text, dest=dest)
-        return res.text
+        return _translate(text, dest)
     except Exception:
         return text
@@ -1,13 +1,34 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Records are handed to a queue on the calling thread and written to disk by one
+# background listener per process, so logging never blocks the request path on file I/O.
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        fh = logging.FileHandler(os.path.join(os.path.dirname(__file__), "ai_booking.log"), delay=True)
+        fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        _listener = QueueListener(_log_queue, fh)
+        _listener.start()
+        # drain queued records before the interpreter exits
+        atexit.register(_listener.stop)
 
 
 def get_logger(name: str = "ai_booking") -> logging.Logger:
     log = logging.getLogger(name)
     if not log.handlers:
         log.setLevel(logging.INFO)
-        fh = logging.FileHandler(os.path.join(os.path.dirname(__file__), "ai_booking.log"))
-        fmt = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
-        fh.setFormatter(fmt)
-        log.addHandler(fh)
+        _ensure_listener()
+        log.addHandler(QueueHandler(_log_queue))
     return log
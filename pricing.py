@@ -5,12 +5,103 @@ Rules implemented:
 - Confidence score reduces price via discount tiers.
 - Simple promo/loyalty placeholders in meta.
 """
-from typing import Tuple, Optional
+from typing import Optional, Tuple
+from bisect import bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+import json
 import os
-import requests
+import tempfile
+import time
 
-# simple in-memory cache for exchange rates
-_FX_CACHE = {}
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Live exchange rates are persisted to a small JSON file next to the app (like bookings.db)
+# so short-lived processes don't refetch them: {currency: {"rate": float, "ts": epoch seconds}}.
+# The file is only consulted when the live API is configured.
+_FX_CACHE_PATH = os.path.join(os.path.dirname(__file__), "fx_cache.json")
+_FX_TTL = 86400
+# how long a failed lookup serves the fallback rate before the API is tried again
+_FX_RETRY_AFTER = 300
+# fallback static demo rate, used when no live rate is available
+_FALLBACK_INR_RATE = 82.0
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _load_fx() -> dict:
+    # the file is shared state; keep only well-formed entries
+    try:
+        with open(_FX_CACHE_PATH, "r") as f:
+            data = json.load(f)
+        return {
+            k: {"rate": float(v["rate"]), "ts": float(v["ts"])}
+            for k, v in data.items()
+            if isinstance(v, dict) and _is_number(v.get("rate")) and _is_number(v.get("ts"))
+        }
+    except Exception:
+        return {}
+
+
+def _save_fx(cache: dict) -> None:
+    # write to a temp file and rename so concurrent readers never see a partial file
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(_FX_CACHE_PATH), prefix=".fx_cache.")
+        with os.fdopen(fd, "w") as f:
+            json.dump({k: v for k, v in cache.items() if not v.get("fallback")}, f)
+        os.replace(tmp, _FX_CACHE_PATH)
+    except Exception:
+        pass
+
+
+@contextmanager
+def _fx_lock():
+    """Cross-process lock around an FX refresh so only one worker hits the API at a time.
+
+    Best effort: if the lock file can't be opened or locked, the refresh runs unlocked.
+    """
+    try:
+        f = open(_FX_CACHE_PATH + ".lock", "a+")
+    except OSError:
+        yield
+        return
+    locked = False
+    try:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                locked = True
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                locked = True
+        except OSError:
+            pass
+        yield
+    finally:
+        if locked:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        f.close()
+
+
+# in-process rates; filled from the shared file (under the lock) on the first live lookup
+_FX_CACHE: dict = {}
 
 BASE_PRICES = {
     "spa": 50.0,
@@ -25,65 +116,115 @@ BASE_PRICES = {
     "flight": 200.0,
 }
 
+# discount tiers: >=90 -> 15%, >=75 -> 10%, >=50 -> 5%, else 0
+_DISCOUNT_THRESHOLDS = (50, 75, 90)
+_DISCOUNT_VALUES = (0.0, 5.0, 10.0, 15.0)
+# price multiplier per reachable discount (tier plus optional gold bump), built with the
+# same expression as the fallback so quotes stay bit-identical
+_DISC_MULT = {d: 1 - d / 100.0 for d in (0.0, 5.0, 10.0, 15.0, 20.0)}
 
-def calculate_price(service: str, confidence_pct: float, meta: Optional[dict] = None, location: Optional[str] = None) -> Tuple[float, float, str]:
-    """Return (final_price, discount_percent)
+# locations priced in INR
+INDIAN_CITIES = frozenset({
+    "bangalore", "bengaluru", "delhi", "mumbai", "chennai", "hyderabad",
+    "vijayawada", "mangalagiri", "kolkata", "pune", "ahmedabad"
+})
 
-    - confidence_pct: 0-100
-    - higher confidence -> better discount (simulated business rule)
+
+@lru_cache(maxsize=1024)
+def _quote_usd(service: str, tier_discount: float, is_gold: bool) -> Tuple[float, float]:
+    """Return (final_usd, discount_percent) for a service at a given confidence tier.
+
+    Keyed by the discount tier rather than the raw confidence, so every confidence
+    in the same tier shares one cache entry and the result is unchanged. The loyalty
+    tier arrives as a bool so arbitrary meta values never become cache keys.
     """
     base = BASE_PRICES.get(service, 50.0)
-    # discount tiers: >90 -> 15%, >75 -> 10%, >50 -> 5%, else 0
-    if confidence_pct >= 90:
-        discount = 15.0
-    elif confidence_pct >= 75:
-        discount = 10.0
-    elif confidence_pct >= 50:
-        discount = 5.0
-    else:
-        discount = 0.0
+    discount = tier_discount
 
     # meta-based loyalty (example)
-    if meta and meta.get("loyalty_tier") == "gold":
+    if is_gold:
         discount += 5.0
 
-    final_usd = round(base * (1 - discount / 100.0), 2)
+    mult = _DISC_MULT.get(discount)
+    if mult is None:
+        mult = 1 - discount / 100.0
+    return round(base * mult, 2), discount
+
+
+@lru_cache(maxsize=1)
+def _fx_session():
+    """Keep-alive HTTP session for rate refreshes, created on first use (requests is imported lazily)."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    session.headers["Connection"] = "keep-alive"
+    return session
 
+
+def _get_rate(currency: str) -> float:
+    """USD -> `currency` rate: live if an API key is configured, otherwise a demo static rate."""
+    # prefer a cached value that is still fresh
+    entry = _FX_CACHE.get(currency)
+    if entry and time.time() - entry["ts"] < (_FX_RETRY_AFTER if entry.get("fallback") else _FX_TTL):
+        return entry["rate"]
+    # optional: external API if FX_API env var set (e.g., https://exchangerate-api.com)
+    api_key = os.getenv("FX_API_KEY")
+    if api_key:
+        with _fx_lock():
+            # another process may have refreshed the shared file while we waited for the lock
+            peer = _load_fx().get(currency)
+            if peer and time.time() - peer["ts"] < _FX_TTL:
+                _FX_CACHE[currency] = peer
+                return peer["rate"]
+            try:
+                resp = _fx_session().get(f"https://open.er-api.com/v6/latest/USD", timeout=3)
+                data = resp.json()
+                rates = data.get("rates", {})
+                rate = rates.get(currency)
+                if rate:
+                    # one USD-anchored response covers every currency; keep them all
+                    now = time.time()
+                    for code, value in rates.items():
+                        if isinstance(value, (int, float)):
+                            _FX_CACHE[code] = {"rate": float(value), "ts": now}
+                    _save_fx(_FX_CACHE)
+                    return float(rate)
+            except Exception:
+                pass
+    # fallback static demo rate; remembered in-process only (and briefly), never persisted
+    _FX_CACHE[currency] = {"rate": _FALLBACK_INR_RATE, "ts": time.time(), "fallback": True}
+    return _FALLBACK_INR_RATE
+
+
+def _currency_for(meta: Optional[dict], location: Optional[str]) -> str:
     # Simple currency selection: if location appears to be in India, convert to INR
-    INDIAN_CITIES = {
-        "bangalore", "bengaluru", "delhi", "mumbai", "chennai", "hyderabad",
-        "vijayawada", "mangalagiri", "kolkata", "pune", "ahmedabad"
-    }
     # if meta explicitly specifies currency, honor it
-    currency = "USD"
-    if meta and meta.get("currency"):
-        currency = meta.get("currency").upper()
-    elif location and location.lower() in INDIAN_CITIES:
-        currency = "INR"
+    # (an explicit currency short-circuits, so the location is never lowercased for it)
+    if meta:
+        currency = meta.get("currency")
+        if currency:
+            return currency.upper()
+    if location and location.lower() in INDIAN_CITIES:
+        return "INR"
+    return "USD"
+
+
+def calculate_price(service: str, confidence_pct: float, meta: Optional[dict] = None, location: Optional[str] = None) -> Tuple[float, float, str]:
+    """Return (final_price, discount_percent)
+
+    - confidence_pct: 0-100
+    - higher confidence -> better discount (simulated business rule)
+    """
+    discount = _DISCOUNT_VALUES[bisect_right(_DISCOUNT_THRESHOLDS, confidence_pct)]
+
+    final_usd, discount = _quote_usd(service, discount, bool(meta) and meta.get("loyalty_tier") == "gold")
+
+    currency = _currency_for(meta, location)
 
     if currency == "INR":
-        # try to get a live rate if an API key is configured, otherwise fallback to a demo static rate
-        def _get_rate():
-            # prefer a cached value
-            if "INR" in _FX_CACHE:
-                return _FX_CACHE["INR"]
-            # optional: external API if FX_API env var set (e.g., https://exchangerate-api.com)
-            api_key = os.getenv("FX_API_KEY")
-            if api_key:
-                try:
-                    resp = requests.get(f"https://open.er-api.com/v6/latest/USD", timeout=3)
-                    data = resp.json()
-                    rate = data.get("rates", {}).get("INR")
-                    if rate:
-                        _FX_CACHE["INR"] = float(rate)
-                        return float(rate)
-                except Exception:
-                    pass
-            # fallback static demo rate
-            _FX_CACHE["INR"] = 82.0
-            return 82.0
-
-        EXCHANGE_RATE = _get_rate()
+        EXCHANGE_RATE = _get_rate("INR")
         final = round(final_usd * EXCHANGE_RATE, 2)
     else:
         final = final_usd
@@ -1,31 +1,77 @@
 import os
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List, Dict
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 
+# reportlab is optional: import it and build the static styles once; the generators
+# raise ImportError when it is missing so callers can fall back to text receipts
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.units import mm
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+    _HAVE_RL = True
+except Exception:
+    _HAVE_RL = False
+
+if _HAVE_RL:
+    _STYLES = getSampleStyleSheet()
+    _META_TABLE_STYLE = TableStyle([
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("TEXTCOLOR", (0, 0), (0, -1), colors.darkgray),
+    ])
+    _ITEMS_TABLE_STYLE = TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.gray),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+    ])
+
+
+def _require_reportlab() -> None:
+    if not _HAVE_RL:
+        raise ImportError("reportlab is required to generate PDF receipts. Install with 'pip install reportlab'.")
+
+
+_CURRENCY_SYMBOLS = {"INR": "₹", "USD": "$", "EUR": "€", "GBP": "£"}
+
+# resolved once; the system temp dir already exists so it needs no makedirs per receipt
+_DEFAULT_OUT_DIR = tempfile.gettempdir()
+
 
 def _currency_symbol(code: str) -> str:
-    return "₹" if code and code.upper() == "INR" else "$"
+    return _CURRENCY_SYMBOLS.get((code or "USD").upper(), "$")
 
 
-def generate_pdf_receipt(booking: dict, out_dir: Optional[str] = None) -> str:
+@lru_cache(maxsize=256)
+def _make_qr_png(data: str) -> Optional[bytes]:
+    """PNG bytes of a QR code for `data`, or None if `qrcode` is unavailable. Cached so
+    re-rendering a receipt (e.g. previews) doesn't re-encode the same id."""
     try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib import colors
-        from reportlab.lib.units import mm
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-    except Exception as e:
-        raise ImportError("reportlab is required to generate PDF receipts. Install with 'pip install reportlab'.") from e
+        import qrcode
+        bio_qr = BytesIO()
+        qr = qrcode.QRCode(box_size=4, border=1)
+        qr.add_data(data)
+        qr.make(fit=True)
+        qr.make_image(fill_color="black", back_color="white").save(bio_qr, format="PNG")
+        return bio_qr.getvalue()
+    except Exception:
+        return None
+
+
+def generate_pdf_receipt(booking: dict, out_dir: Optional[str] = None) -> str:
+    """Write the receipt from `generate_pdf_bytes` to `out_dir` and return its path."""
+    pdf_bytes = generate_pdf_bytes(booking)
 
     # write PDFs to a safe temporary directory by default to avoid permission issues
     if out_dir is None:
-        out_dir = tempfile.gettempdir()
-    os.makedirs(out_dir, exist_ok=True)
+        out_dir = _DEFAULT_OUT_DIR
+    else:
+        os.makedirs(out_dir, exist_ok=True)
 
-    # Optional QR generation placeholder (generate_pdf_bytes will also attempt QR if available)
-    pdf_bytes = generate_pdf_bytes(booking)
     booking_id = booking.get("id", f"bkg_{datetime.utcnow().timestamp()}")
     filename = f"receipt_{booking_id}.pdf"
     path = os.path.join(out_dir, filename)
@@ -36,32 +82,17 @@ def generate_pdf_receipt(booking: dict, out_dir: Optional[str] = None) -> str:
 
 def generate_pdf_bytes(booking: dict) -> bytes:
     """Generate a PDF in-memory and return bytes. Uses ReportLab; raises ImportError if missing."""
-    try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib import colors
-        from reportlab.lib.units import mm
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-    except Exception as e:
-        raise ImportError("reportlab is required to generate PDF receipts. Install with 'pip install reportlab'.") from e
-
-    # Optional QR generation
-    qr_png = None
-    try:
-        import qrcode
-        bio_qr = BytesIO()
-        qr = qrcode.QRCode(box_size=4, border=1)
-        qr.add_data(booking.get("id", ""))
-        qr.make(fit=True)
-        qr.make_image(fill_color="black", back_color="white").save(bio_qr, format="PNG")
-        bio_qr.seek(0)
-        qr_png = bio_qr
-    except Exception:
-        qr_png = None
+    _require_reportlab()
+
+    # Optional QR generation (skipped when there is no booking id to encode)
+    booking_id = booking.get("id")
+    png = _make_qr_png(str(booking_id)) if booking_id else None
+    # fresh stream per receipt: the Image flowable reads from the current position
+    qr_png = BytesIO(png) if png else None
 
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
-    styles = getSampleStyleSheet()
+    styles = _STYLES
     story: List = []
 
     # Header
@@ -80,10 +111,7 @@ def generate_pdf_bytes(booking: dict) -> bytes:
         ["Time:", booking.get("time") or "-"],
     ]
     t = Table(meta_table_data, hAlign="LEFT", colWidths=[80 * mm, 80 * mm])
-    t.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("TEXTCOLOR", (0, 0), (0, -1), colors.darkgray),
-    ]))
+    t.setStyle(_META_TABLE_STYLE)
     story.append(t)
     story.append(Spacer(1, 12))
 
@@ -126,11 +154,7 @@ def generate_pdf_bytes(booking: dict) -> bytes:
     table_data.append(["Total", f"{symbol}{float(total):,.2f}"])
 
     tbl = Table(table_data, hAlign="LEFT", colWidths=[110 * mm, 40 * mm])
-    tbl.setStyle(TableStyle([
-        ("GRID", (0, 0), (-1, -1), 0.25, colors.gray),
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-    ]))
+    tbl.setStyle(_ITEMS_TABLE_STYLE)
     story.append(tbl)
     story.append(Spacer(1, 12))
 
@@ -160,6 +184,19 @@ def generate_pdf_bytes(booking: dict) -> bytes:
     return buffer.getvalue()
 
 
+def generate_pdf_bytes_batch(bookings: List[dict], workers: Optional[int] = None) -> List[bytes]:
+    """Render many receipts across a process pool (layout and PNG encoding are CPU-bound).
+
+    Returns the PDFs in input order; `workers` defaults to the CPU count.
+    """
+    _require_reportlab()
+    if len(bookings) <= 1:
+        # not worth starting worker processes
+        return [generate_pdf_bytes(b) for b in bookings]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(generate_pdf_bytes, bookings, chunksize=max(1, len(bookings) // 32)))
+
+
 if __name__ == "__main__":
     # produce a sample receipt using the example provided by the user
     sample = {
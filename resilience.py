@@ -0,0 +1,50 @@
+"""Retry with exponential backoff for flaky network calls (LLM, translation, TTS).
+
+Uses `tenacity` when installed; otherwise falls back to a small built-in loop with the same
+policy (random exponential wait, bounded attempts) so behaviour doesn't depend on the extra package.
+"""
+import functools
+import random
+import time
+from typing import Callable, Tuple, Type
+
+try:
+    from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+except Exception:
+    retry = None
+
+
+def with_backoff(
+    attempts: int = 3,
+    min_wait: float = 1.0,
+    max_wait: float = 20.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+) -> Callable:
+    """Decorator: retry the wrapped call up to `attempts` times on `retry_on` errors.
+
+    Waits grow exponentially (randomized, clamped to [min_wait, max_wait]) between attempts.
+    The last error is re-raised unchanged so callers keep their existing fallbacks.
+    """
+    def decorator(func: Callable) -> Callable:
+        if retry is not None:
+            return retry(
+                wait=wait_random_exponential(min=min_wait, max=max_wait),
+                stop=stop_after_attempt(attempts),
+                retry=retry_if_exception_type(retry_on),
+                reraise=True,
+            )(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except retry_on:
+                    if attempt == attempts - 1:
+                        raise
+                    upper = min(max_wait, 2 ** attempt)
+                    time.sleep(min(max_wait, max(min_wait, random.uniform(0, upper))))
+
+        return wrapper
+
+    return decorator
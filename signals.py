@@ -2,8 +2,13 @@
 
 These are small heuristics suitable for demos. They return a style tag and urgency flag.
 """
+import re
 from typing import Tuple
 
+# plain substring alternations, same matches as testing each word with `in`
+# ('now' deliberately also matches inside 'know')
+_URGENT_RE = re.compile(r"urgent|asap|now|immediately|need a|emergency")
+_POLITE_RE = re.compile(r"please|thank you|thanks")
 
 def detect_urgency_and_style(text: str) -> Tuple[bool, str]:
     """Return (is_urgent, style) where style is one of: 'concise','formal','friendly'.
@@ -11,15 +16,13 @@ def detect_urgency_and_style(text: str) -> Tuple[bool, str]:
     Simple keyword-based heuristics.
     """
     t = (text or "").lower()
-    urgent_words = ["urgent", "asap", "now", "immediately", "need a", "emergency"]
-    polite_words = ["please", "thank you", "thanks"]
 
-    is_urgent = any(w in t for w in urgent_words)
+    is_urgent = _URGENT_RE.search(t) is not None
 
-    # style heuristics
-    if len(t.split()) < 4:
+    # style heuristics; fewer than 4 words, without splitting the whole message
+    if len(t.split(None, 3)) < 4:
         style = "concise"
-    elif any(w in t for w in polite_words):
+    elif _POLITE_RE.search(t):
         style = "formal"
     else:
         style = "friendly"
@@ -1,20 +1,34 @@
-from typing import Tuple, List, Optional
-from bookings_store import add_booking, find_bookings, load_bookings, update_booking, remove_booking
+from typing import Dict, Tuple, List, Optional, Sequence, Set
+from bookings_store import add_booking, add_booking_if_free, find_booking_by_id, find_bookings, find_bookings_for_day, load_bookings, load_bookings_page, update_booking, remove_booking
 
-# Standardized available slots (times in H:MM AM/PM)
+# Standardized available slots (times in H:MM AM/PM); tuples, since the table is fixed
 AVAILABLE_SLOTS = {
-    "spa": ["9:00 AM", "10:00 AM", "11:00 AM", "4:00 PM"],
-    "salon": ["10:00 AM", "12:00 PM", "3:00 PM"],
-    "facial": ["10:00 AM", "11:00 AM", "3:00 PM"],
-    "dental": ["9:00 AM", "11:00 AM", "2:00 PM"],
-    "doctor": ["9:00 AM", "1:00 PM", "6:00 PM"],
-    "head spa": ["10:00 AM", "2:00 PM"],
-    "hotel": ["Anytime"],
-    "travel": ["Morning", "Evening"]
+    "spa": ("9:00 AM", "10:00 AM", "11:00 AM", "4:00 PM"),
+    "salon": ("10:00 AM", "12:00 PM", "3:00 PM"),
+    "facial": ("10:00 AM", "11:00 AM", "3:00 PM"),
+    "dental": ("9:00 AM", "11:00 AM", "2:00 PM"),
+    "doctor": ("9:00 AM", "1:00 PM", "6:00 PM"),
+    "head spa": ("10:00 AM", "2:00 PM"),
+    "hotel": ("Anytime",),
+    "travel": ("Morning", "Evening")
 }
+# membership tests per service
+_SLOT_SET = {svc: frozenset(slots) for svc, slots in AVAILABLE_SLOTS.items()}
 
 
-def check_availability(service: str, date: Optional[str], time: Optional[str]) -> Tuple[bool, List[str]]:
+def _services_by_time() -> Dict[str, List[str]]:
+    """Reverse index of the (fixed) slot table: time -> services offering it, in table order."""
+    index: Dict[str, List[str]] = {}
+    for svc, slots in AVAILABLE_SLOTS.items():
+        for t in dict.fromkeys(slots):
+            index.setdefault(t, []).append(svc)
+    return index
+
+
+_TIME_TO_SERVICES = _services_by_time()
+
+
+def check_availability(service: str, date: Optional[str], time: Optional[str]) -> Tuple[bool, Sequence[str]]:
     """Return (available, slots) for a service on a particular date/time.
 
     If service not listed, treat as available with 'Anytime'.
@@ -22,10 +36,10 @@ def check_availability(service: str, date: Optional[str], time: Optional[str]) -
     If a specific time is requested, check existing bookings for conflicts.
     """
     if service not in AVAILABLE_SLOTS:
-        return True, ["Anytime"]
+        return True, ("Anytime",)
 
     slots = AVAILABLE_SLOTS[service]
-    if "Anytime" in slots:
+    if "Anytime" in _SLOT_SET[service]:
         return True, slots
 
     if not time:
@@ -41,21 +55,37 @@ def check_availability(service: str, date: Optional[str], time: Optional[str]) -
     return True, slots
 
 
-def book_slot(service: str, date: str, time: str, location: Optional[str] = None, meta: Optional[dict] = None) -> dict:
-    """Attempt to book a slot; returns the booking entry on success.
-    Raises ValueError if slot unavailable.
-    """
-    available, slots = check_availability(service, date, time)
-    if not available:
-        raise ValueError("Requested time is not available")
+def check_and_book(service: str, date: Optional[str], time: Optional[str], location: Optional[str] = None, meta: Optional[dict] = None) -> Tuple[Optional[dict], List[str]]:
+    """Check availability and book in a single store round trip.
 
-    booking = add_booking({
+    Returns (booking, []) on success or (None, alternatives) when the slot is taken.
+    Services without fixed slots ('Anytime' or unlisted) are booked unconditionally,
+    mirroring check_availability.
+    """
+    entry = {
         "service": service,
         "date": date,
         "time": time,
         "location": location,
         "meta": meta or {}
-    })
+    }
+    slots = AVAILABLE_SLOTS.get(service)
+    if slots is None or "Anytime" in _SLOT_SET[service] or not time:
+        return add_booking(entry), []
+
+    booking = add_booking_if_free(entry)
+    if booking is None:
+        return None, [s for s in slots if s != time]
+    return booking, []
+
+
+def book_slot(service: str, date: str, time: str, location: Optional[str] = None, meta: Optional[dict] = None) -> dict:
+    """Attempt to book a slot; returns the booking entry on success.
+    Raises ValueError if slot unavailable.
+    """
+    booking, _ = check_and_book(service, date, time, location, meta)
+    if booking is None:
+        raise ValueError("Requested time is not available")
     return booking
 
 
@@ -64,13 +94,19 @@ def attempt_resolve(service: str, date: str, time: str, allow_nearby: bool = Tru
 
     Returns a dict with keys: available (bool), suggestion (time or None), alternatives (list)
     """
-    available, slots = check_availability(service, date, time)
-    if available:
+    slots = AVAILABLE_SLOTS.get(service)
+    if slots is None or "Anytime" in _SLOT_SET[service] or not time:
+        available, slots = check_availability(service, date, time)
+        return {"available": True, "suggestion": time, "alternatives": slots}
+
+    # one query for the day answers both the availability check and the next free slot
+    booked = find_bookings_for_day(service, date)
+    if time not in booked:
         return {"available": True, "suggestion": time, "alternatives": slots}
 
     # Suggest next available on same date
-    nxt = find_next_available(service, date, after_time=time)
-    alternatives = slots
+    nxt = _first_free(slots, booked, after_time=time)
+    alternatives = [s for s in slots if s != time]
     suggestion = None
     if nxt:
         suggestion = nxt[0]
@@ -78,11 +114,7 @@ def attempt_resolve(service: str, date: str, time: str, allow_nearby: bool = Tru
     # Optionally, suggest same time at other services (simple nearby logic)
     other_options = []
     if allow_nearby:
-        for s, s_slots in AVAILABLE_SLOTS.items():
-            if s == service:
-                continue
-            if time in s_slots:
-                other_options.append({"service": s, "time": time})
+        other_options = [{"service": s, "time": time} for s in _TIME_TO_SERVICES.get(time, ()) if s != service]
 
     return {"available": False, "suggestion": suggestion, "alternatives": alternatives, "other_options": other_options}
 
@@ -102,45 +134,47 @@ def auto_book_alternative(service: str, date: str, time: Optional[str] = None) -
     return book_slot(service, date, chosen_time)
 
 
-def find_next_available(service: str, date: str, after_time: Optional[str] = None) -> Optional[Tuple[str, List[str]]]:
+def find_next_available(service: str, date: str, after_time: Optional[str] = None) -> Optional[Tuple[str, Sequence[str]]]:
     """Return the next free slot (time, slots) after a given time on a date, or None.
     """
     if service not in AVAILABLE_SLOTS:
         return None
     slots = AVAILABLE_SLOTS[service]
+    return _first_free(slots, find_bookings_for_day(service, date), after_time)
+
+
+def _first_free(slots: Sequence[str], booked: Set[str], after_time: Optional[str] = None) -> Optional[Tuple[str, Sequence[str]]]:
     # if after_time not provided, return first free
     for s in slots:
         if after_time and s == after_time:
             continue
-        # check bookings
-        booked = find_bookings(service=service, date=date, time=s)
-        if not booked:
+        if s not in booked:
             return s, slots
     return None
 
 
 def modify_booking(booking_id: str, new_date: Optional[str] = None, new_time: Optional[str] = None) -> Optional[dict]:
-    bookings = load_bookings()
-    for b in bookings:
-        if b.get("id") == booking_id:
-            service = b.get("service")
-            date = new_date or b.get("date")
-            time = new_time or b.get("time")
-            # check availability
-            available, _ = check_availability(service, date, time)
-            if not available:
-                raise ValueError("Requested new time is not available")
-            b["date"] = date
-            b["time"] = time
-            save = update_booking(booking_id, {"date": date, "time": time})
-            return save
-    return None
+    b = find_booking_by_id(booking_id)
+    if not b:
+        return None
+    service = b.get("service")
+    date = new_date or b.get("date")
+    time = new_time or b.get("time")
+    # check availability
+    available, _ = check_availability(service, date, time)
+    if not available:
+        raise ValueError("Requested new time is not available")
+    # the store writes the change and hands back the updated booking; `b` stays untouched
+    return update_booking(booking_id, {"date": date, "time": time})
 
 
 def cancel_booking(booking_id: str) -> bool:
     return remove_booking(booking_id)
 
 
-def list_bookings():
-    return load_bookings()
+def list_bookings(after: Optional[Tuple[str, str]] = None, limit: Optional[int] = None):
+    """Return all bookings, or one keyset-paginated page of them when `limit` is given."""
+    if limit is None:
+        return load_bookings()
+    return load_bookings_page(after=after, limit=limit)
 
@@ -0,0 +1,156 @@
+"""Booking summaries generated through the OpenAI Batch API.
+
+Bulk paths (e.g. seeding demo bookings) don't need an answer right away, so instead of one
+synchronous completion per booking the requests are written to a JSONL file and submitted as a
+single batch job. Batch jobs are billed at half the synchronous price and don't count against
+the per-minute rate limits; results are collected later and stored in the booking's meta.
+
+Requests that fail inside the batch are retried synchronously on the "flex" service tier,
+which trades a lower per-token price for possible queueing. The retry runs inside an admin
+click, so it uses a short timeout, retries only rate-limit/timeout errors and stops at a
+total time budget; bookings it doesn't reach simply keep no summary.
+"""
+import json
+import time
+from typing import Dict, List, Optional
+
+from bookings_store import find_booking_by_id, update_booking
+from resilience import with_backoff
+
+SUMMARY_MODEL = "gpt-4o-mini"
+# flex processing is only offered on a subset of models
+FLEX_MODEL = "o4-mini"
+# per-request timeout for the synchronous flex retry
+FLEX_TIMEOUT_S = 30.0
+# wall-clock budget for all flex retries of one collected batch
+FLEX_RETRY_BUDGET_S = 90.0
+SUMMARY_PROMPT = (
+    "You write short booking confirmations. "
+    "Summarize the booking below in one friendly sentence."
+)
+
+try:
+    from openai import APITimeoutError, RateLimitError
+    # flex answers 429 when capacity is short; anything else won't improve on retry
+    _FLEX_RETRYABLE = (RateLimitError, APITimeoutError)
+except Exception:
+    _FLEX_RETRYABLE = ()
+
+
+class SummaryBatchError(RuntimeError):
+    """The batch job ended without output (failed or cancelled); it won't finish later."""
+
+
+def _summary_body(booking: dict) -> dict:
+    details = {k: booking.get(k) for k in ("service", "date", "time", "location")}
+    return {
+        "model": SUMMARY_MODEL,
+        "messages": [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": json.dumps(details)},
+        ],
+    }
+
+
+@with_backoff(attempts=2, max_wait=5.0, retry_on=_FLEX_RETRYABLE)
+def summarize_booking(client, booking: dict, timeout: float = FLEX_TIMEOUT_S) -> str:
+    """Summarize one booking synchronously on the low-cost flex tier (background use only)."""
+    body = _summary_body(booking)
+    response = client.chat.completions.create(
+        model=FLEX_MODEL,
+        messages=body["messages"],
+        service_tier="flex",
+        timeout=timeout,
+    )
+    return response.choices[0].message.content
+
+
+def build_batch_requests(bookings: List[dict]) -> str:
+    """Return the Batch API input file (JSONL), one chat completion request per booking."""
+    lines = []
+    for b in bookings:
+        if not b.get("id"):
+            continue
+        lines.append(json.dumps({
+            "custom_id": b["id"],
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _summary_body(b),
+        }))
+    return "\n".join(lines)
+
+
+def submit_summary_batch(client, bookings: List[dict]) -> Optional[str]:
+    """Upload the requests and start a batch job. Returns the batch id (None if nothing to do)."""
+    payload = build_batch_requests(bookings)
+    if not payload:
+        return None
+    input_file = client.files.create(file=("summaries.jsonl", payload.encode("utf-8")), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def collect_summary_batch(client, batch_id: str) -> Optional[Dict[str, str]]:
+    """Store the summaries of a finished batch on their bookings.
+
+    Returns {booking_id: summary}, or None while the batch is still running. An expired
+    batch yields whatever it completed in time (its unfinished requests count as failed);
+    a failed or cancelled batch raises `SummaryBatchError`.
+    """
+    batch = client.batches.retrieve(batch_id)
+    if batch.status in ("failed", "cancelled"):
+        detail = ""
+        errors = getattr(getattr(batch, "errors", None), "data", None)
+        if errors:
+            detail = f": {errors[0].message}"
+        raise SummaryBatchError(f"Summary batch {batch_id} {batch.status}{detail}")
+    if batch.status not in ("completed", "expired"):
+        return None
+    summaries: Dict[str, str] = {}
+    failed: List[str] = []
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    summaries[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+                else:
+                    failed.append(item["custom_id"])
+            except Exception:
+                continue
+
+    # resolve only the bookings this batch mentions (deleted ones are skipped)
+    by_id = {}
+    for booking_id in dict.fromkeys([*summaries, *failed]):
+        booking = find_booking_by_id(booking_id)
+        if booking is not None:
+            by_id[booking_id] = booking
+    # anything the batch couldn't do is retried on the flex tier, within the time budget
+    deadline = time.monotonic() + FLEX_RETRY_BUDGET_S
+    for booking_id in failed:
+        if booking_id in by_id and booking_id not in summaries:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                summaries[booking_id] = summarize_booking(client, by_id[booking_id], timeout=min(FLEX_TIMEOUT_S, remaining))
+            except Exception:
+                continue
+
+    for booking_id, summary in summaries.items():
+        existing = by_id.get(booking_id)
+        if existing is None:
+            continue
+        meta = dict(existing.get("meta") or {})
+        meta["summary"] = summary
+        update_booking(booking_id, {"meta": meta})
+    return summaries
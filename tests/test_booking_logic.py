@@ -19,3 +19,14 @@ def test_fuzzy_time_detection():
     assert state["time"] == "evening"
     assert state["confidences"]["time"] < 0.8
     assert "evening" in state["ambiguities"]
+
+
+def test_incremental_extraction_matches_full_replay():
+    messages = [{"role": "user", "content": "I need a spa appointment"}]
+    extract_booking_state(messages)
+    messages.append({"role": "user", "content": "on 2099-01-05 at 9am in Delhi"})
+    messages.append({"role": "user", "content": "actually, cancel it"})
+    incremental = extract_booking_state(messages)
+    assert incremental == extract_booking_state(list(messages))
+    assert incremental["intent"] == "cancel"
+    assert incremental["location"] == "delhi"
@@ -0,0 +1,32 @@
+from bookings_store import add_booking, find_bookings, load_bookings_page, remove_booking, update_booking
+
+
+def test_meta_round_trips_through_split_columns():
+    meta = {
+        "salon": "Salon A",
+        "total": 2000.0,
+        "currency": "INR",
+        "items": [{"name": "Manicure", "price": 800.0}],
+        "demo": True,
+    }
+    booking = add_booking({"service": "salon", "date": "2099-01-03", "time": "10:00 AM", "meta": meta})
+    assert find_bookings(service="salon", date="2099-01-03", time="10:00 AM")[0]["meta"] == meta
+
+    updated = update_booking(booking["id"], {"meta": {"summary": "See you soon", "total": 1500.0}})
+    assert updated["meta"] == {"summary": "See you soon", "total": 1500.0}
+
+    assert remove_booking(booking["id"])
+
+
+def test_pages_follow_creation_order():
+    ids = [add_booking({"service": "spa", "date": "2099-01-04", "time": t})["id"] for t in ("9:00 AM", "10:00 AM", "11:00 AM")]
+    seen, after = [], None
+    while True:
+        page = load_bookings_page(after=after, limit=2)
+        if not page:
+            break
+        seen.extend(b["id"] for b in page)
+        after = (page[-1]["created_at"], page[-1]["id"])
+    assert [i for i in seen if i in ids] == ids
+    for booking_id in ids:
+        remove_booking(booking_id)
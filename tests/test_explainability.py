@@ -0,0 +1,14 @@
+from explainability import compute_explainability_score, compute_explainability_scores
+
+
+def test_batch_scores_match_single_state_scores():
+    states = [
+        {"service": "spa", "date": "2099-01-01", "time": "9:00 AM", "location": "delhi",
+         "confidences": {"service": 0.95, "date": 0.9, "time": 0.95, "location": 0.9}, "ambiguities": []},
+        {"service": "salon", "date": None, "time": "evening", "location": None,
+         "confidences": {"service": 0.95, "time": 0.7}, "ambiguities": ["evening"]},
+        {"confidences": {}, "ambiguities": []},
+    ]
+    expected = [compute_explainability_score(s)["score"] for s in states]
+    assert compute_explainability_scores(states) == expected
+    assert expected[0] > expected[1] > expected[2] == 0.0
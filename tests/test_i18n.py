@@ -0,0 +1,10 @@
+from i18n import fast_lang
+
+
+def test_fast_lang_ascii_is_english():
+    assert fast_lang("Book a spa tomorrow at 10am in Mumbai") == "en"
+
+
+def test_fast_lang_defers_non_ascii_to_detector():
+    assert fast_lang("నాకు హెడ్ స్పా కావాలి") is None
+    assert fast_lang("") is None
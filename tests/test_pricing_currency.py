@@ -1,8 +1,40 @@
+import json
+
+import pytest
+
+import pricing
 from pricing import calculate_price
 
 
+@pytest.fixture(autouse=True)
+def isolated_fx_cache(tmp_path, monkeypatch):
+    # keep the shared rate file and in-process rates out of the test
+    monkeypatch.setattr(pricing, "_FX_CACHE_PATH", str(tmp_path / "fx_cache.json"))
+    monkeypatch.setattr(pricing, "_FX_CACHE", {})
+    monkeypatch.delenv("FX_API_KEY", raising=False)
+    return tmp_path / "fx_cache.json"
+
+
 def test_pricing_inr_for_indian_city():
     price, discount, currency = calculate_price("facial", 76.0, None, location="vijayawada")
     assert currency == "INR"
     # base 27, discount 10% -> 24.3 USD -> INR ~ 24.3 * 82
     assert price == round(24.3 * 82.0, 2)
+
+
+def test_rate_file_ignored_without_live_api(isolated_fx_cache):
+    isolated_fx_cache.write_text(json.dumps({"INR": {"rate": 83.5, "ts": 4102444800}}))
+    price, _, _ = calculate_price("facial", 76.0, None, location="vijayawada")
+    assert price == round(24.3 * 82.0, 2)
+
+
+def test_malformed_rate_file_falls_back(isolated_fx_cache, monkeypatch):
+    isolated_fx_cache.write_text(json.dumps({"INR": {"rate": 83, "ts": "yesterday"}}))
+    monkeypatch.setenv("FX_API_KEY", "test")
+
+    def offline():
+        raise OSError("offline")
+
+    monkeypatch.setattr(pricing, "_fx_session", offline)
+    price, _, _ = calculate_price("facial", 76.0, None, location="vijayawada")
+    assert price == round(24.3 * 82.0, 2)
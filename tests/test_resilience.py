@@ -0,0 +1,29 @@
+import pytest
+from resilience import with_backoff
+
+
+def test_retries_until_success():
+    calls = []
+
+    @with_backoff(attempts=3, min_wait=0, max_wait=0)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("transient")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+
+
+def test_non_retryable_error_is_raised_immediately():
+    calls = []
+
+    @with_backoff(attempts=3, min_wait=0, max_wait=0, retry_on=(ConnectionError,))
+    def broken():
+        calls.append(1)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        broken()
+    assert len(calls) == 1
@@ -1,5 +1,5 @@
 import os
-from slot_engine import book_slot, check_availability, cancel_booking, list_bookings
+from slot_engine import book_slot, check_and_book, check_availability, cancel_booking, list_bookings
 
 
 def test_booking_flow():
@@ -29,3 +29,16 @@ def test_booking_flow():
     # After cancellation it should be available again
     available, _ = check_availability(service, date, time)
     assert available
+
+
+def test_check_and_book_reports_conflict():
+    service, date, time = "doctor", "2099-01-02", "1:00 PM"
+    booking, alternatives = check_and_book(service, date, time, location="delhi")
+    assert booking is not None and alternatives == []
+
+    # the same slot cannot be taken twice; alternatives are the other slots of the day
+    again, alternatives = check_and_book(service, date, time)
+    assert again is None
+    assert time not in alternatives and alternatives
+
+    assert cancel_booking(booking["id"])
@@ -0,0 +1,30 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from summaries import SummaryBatchError, build_batch_requests, collect_summary_batch
+
+
+def test_batch_requests_one_line_per_booking():
+    bookings = [
+        {"id": "bkg_a", "service": "spa", "date": "2099-01-01", "time": "9:00 AM", "location": "mumbai"},
+        {"id": "bkg_b", "service": "doctor", "date": "2099-01-02", "time": "1:00 PM", "location": "delhi"},
+        {"service": "salon"},  # no id -> cannot be matched back, skipped
+    ]
+    lines = build_batch_requests(bookings).splitlines()
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["custom_id"] == "bkg_a"
+    assert first["url"] == "/v1/chat/completions"
+    assert "spa" in first["body"]["messages"][-1]["content"]
+
+
+def test_collect_reports_terminal_batch_states():
+    def client_for(status):
+        batch = SimpleNamespace(status=status, errors=None, output_file_id=None, error_file_id=None)
+        return SimpleNamespace(batches=SimpleNamespace(retrieve=lambda batch_id: batch))
+
+    assert collect_summary_batch(client_for("in_progress"), "batch_1") is None
+    for status in ("failed", "cancelled"):
+        with pytest.raises(SummaryBatchError):
+            collect_summary_batch(client_for(status), "batch_1")
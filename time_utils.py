@@ -2,6 +2,21 @@ import re
 from datetime import datetime, time
 from typing import Optional
 
+# compiled once at import; normalize_time runs on every user message
+_RE_AMPM = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)\b")
+_RE_24H = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b")
+
+# every legal (hour, minute) pre-formatted as 'H:MM AM/PM' (1440 short strings)
+_TIME_FMT = {(h, m): time(h, m).strftime("%I:%M %p").lstrip("0") for h in range(24) for m in range(60)}
+
+
+def _fmt(hour: int, minute: int) -> str:
+    fmt = _TIME_FMT.get((hour, minute))
+    if fmt is None:
+        # out-of-range values (e.g. '13pm') still raise from time() as before
+        fmt = time(hour=hour, minute=minute).strftime("%I:%M %p").lstrip("0")
+    return fmt
+
 
 def normalize_time(text: str) -> Optional[str]:
     """Normalize a time phrase into 12-hour format 'H:MM AM/PM'.
@@ -15,7 +30,7 @@ def normalize_time(text: str) -> Optional[str]:
     s = text.lower()
 
     # 12-hour with am/pm, e.g. '9am', '9:30 am'
-    m = re.search(r"\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)\b", s)
+    m = _RE_AMPM.search(s)
     if m:
         hour = int(m.group(1))
         minute = int(m.group(2) or "0")
@@ -24,16 +39,14 @@ def normalize_time(text: str) -> Optional[str]:
             hour = hour + 12
         if period == "am" and hour == 12:
             hour = 0
-        t = time(hour=hour, minute=minute)
-        return t.strftime("%I:%M %p").lstrip("0")
+        return _fmt(hour, minute)
 
     # 24-hour format like '14:30' or '9:00'
-    m2 = re.search(r"\b([01]?\d|2[0-3]):([0-5]\d)\b", s)
+    m2 = _RE_24H.search(s)
     if m2:
         hour = int(m2.group(1))
         minute = int(m2.group(2))
-        t = time(hour=hour, minute=minute)
-        return t.strftime("%I:%M %p").lstrip("0")
+        return _fmt(hour, minute)
 
     # fallback: single hour with am/pm separated (e.g., '9 pm' handled above), otherwise give up
     return None